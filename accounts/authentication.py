@@ -1,18 +1,21 @@
-from accounts.models import Token, User
+from accounts.models import Token
+from accounts.user_cache import get_or_create_user, get_user
+from superlists.routers import replica_reads
 
 
 class PasswordlessAuthenticationBackend(object):
     def authenticate(self, uid):
         try:
-            token: Token = Token.objects.get(uid=uid)
-            return User.objects.get(email=token.email)
-        except (User.DoesNotExist, Token.DoesNotExist) as e:
-            if type(e) is User.DoesNotExist:
-                return User.objects.create(email=token.email)
+            token: Token = Token.objects.valid().get(uid=uid)
+        except Token.DoesNotExist:
             return None
+        # Tokens are single-use. If two requests race for the same token, only
+        # the one that deletes it logs in.
+        deleted, _ = Token.objects.filter(pk=token.pk).delete()
+        if not deleted:
+            return None
+        return get_or_create_user(token.email)
 
     def get_user(self, email):
-        try:
-            return User.objects.get(email=email)
-        except User.DoesNotExist:
-            return None
+        with replica_reads():
+            return get_user(email)
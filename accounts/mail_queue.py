@@ -0,0 +1,79 @@
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import QueuedEmail
+
+
+def queue_mail(subject, message, from_email, recipient):
+    """Store an email for the worker to send, instead of sending it inline."""
+    return QueuedEmail.objects.create(
+        subject=subject, body=message, from_email=from_email, to=recipient
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the given number of failed attempts."""
+    return timedelta(seconds=settings.MAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def send_queued_mail(connection=None, batch_size=None):
+    """Send one batch of due emails over a single connection.
+
+    ``connection`` is left open afterwards, so a worker can reuse it for the
+    next batch. Failed emails are retried with exponential backoff until
+    ``MAIL_QUEUE_MAX_ATTEMPTS``. Returns the number of emails sent.
+    """
+    batch_size = batch_size or settings.MAIL_QUEUE_BATCH_SIZE
+    now = timezone.now()
+    emails = list(
+        QueuedEmail.objects.filter(
+            status=QueuedEmail.PENDING, send_after__lte=now
+        ).order_by("send_after", "id")[:batch_size]
+    )
+    if not emails:
+        return 0
+
+    connection = connection or get_connection()
+    sent = 0
+    for email in emails:
+        try:
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                [email.to],
+                connection=connection,
+            )
+            # Opening up front keeps the connection open between messages
+            connection.open()
+            message.send()
+        except (smtplib.SMTPException, OSError) as e:
+            # Drop the connection, the next send opens a fresh one
+            connection.close()
+            _record_failure(email, e, now)
+        except Exception as e:
+            _record_failure(email, e, now)
+        else:
+            # Right away, so a crash later in the batch can't get it resent
+            QueuedEmail.objects.filter(pk=email.pk).update(
+                status=QueuedEmail.SENT,
+                sent_at=timezone.now(),
+                attempts=F("attempts") + 1,
+            )
+            sent += 1
+    return sent
+
+
+def _record_failure(email, error, now):
+    email.attempts += 1
+    email.last_error = repr(error)
+    if email.attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+        email.status = QueuedEmail.FAILED
+    else:
+        email.send_after = now + retry_delay(email.attempts)
+    email.save(update_fields=["attempts", "last_error", "status", "send_after"])
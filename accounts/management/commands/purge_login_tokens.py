@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from accounts.models import Token
+
+
+class Command(BaseCommand):
+    help = "Delete expired login tokens in small batches."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to wait between batches, so logins aren't held up.",
+        )
+
+    def handle(self, *args, **options):
+        purged = 0
+        while True:
+            # Each batch is its own short write, rather than one long DELETE
+            # locking the table while the expired backlog is removed.
+            pks = list(
+                Token.objects.expired()
+                .order_by("created_at")
+                .values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not pks:
+                break
+            Token.objects.filter(pk__in=pks).delete()
+            purged += len(pks)
+            if len(pks) < options["batch_size"]:
+                break
+            time.sleep(options["pause"])
+        self.stdout.write(f"Purged {purged} expired login tokens")
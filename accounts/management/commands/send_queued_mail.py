@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandParser
+
+from accounts.mail_queue import send_queued_mail
+
+
+class Command(BaseCommand):
+    help = "Send queued emails, reusing one SMTP connection while there's work."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once", action="store_true", help="Send what is due, then exit."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.MAIL_QUEUE_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.MAIL_QUEUE_POLL_INTERVAL,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        try:
+            while True:
+                sent = send_queued_mail(connection, options["batch_size"])
+                if sent:
+                    self.stdout.write(f"Sent {sent} emails")
+                    continue
+                if options["once"]:
+                    return
+                # Don't hold an idle connection to the mail server
+                connection.close()
+                time.sleep(options["poll_interval"])
+        finally:
+            connection.close()
@@ -1,7 +1,10 @@
 import uuid
+from datetime import timedelta
 
+from django.conf import settings
 from django.contrib import auth
 from django.db import models
+from django.utils import timezone
 
 auth.signals.user_logged_in.disconnect(auth.models.update_last_login)
 
@@ -14,6 +17,43 @@ class User(models.Model):
     email = models.EmailField(primary_key=True)
 
 
+class TokenQuerySet(models.QuerySet):
+    def _cutoff(self):
+        return timezone.now() - timedelta(seconds=settings.LOGIN_TOKEN_TTL)
+
+    def valid(self):
+        return self.filter(created_at__gte=self._cutoff())
+
+    def expired(self):
+        return self.filter(created_at__lt=self._cutoff())
+
+
 class Token(models.Model):
     email = models.EmailField()
-    uid = models.CharField(default=uuid.uuid4, max_length=40)
+    uid = models.CharField(default=uuid.uuid4, max_length=40, unique=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TokenQuerySet.as_manager()
+
+
+class QueuedEmail(models.Model):
+    """An email waiting to be sent by the ``send_queued_mail`` worker."""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = ((PENDING, "Pending"), (SENT, "Sent"), (FAILED, "Failed"))
+
+    class Meta:
+        index_together = ("status", "send_after")
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.EmailField()
+    to = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    send_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
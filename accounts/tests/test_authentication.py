@@ -1,5 +1,9 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from accounts.authentication import PasswordlessAuthenticationBackend
 from accounts.models import Token
@@ -8,6 +12,9 @@ User = get_user_model()
 
 
 class AuthenticateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_returns_none_if_no_such_token(self):
         result = PasswordlessAuthenticationBackend().authenticate("no-such-token")
         self.assertIsNone(result)
@@ -26,8 +33,27 @@ class AuthenticateTest(TestCase):
         user = PasswordlessAuthenticationBackend().authenticate(token.uid)
         self.assertEqual(user, existing_user)
 
+    def test_token_can_only_be_used_once(self):
+        token: Token = Token.objects.create(email="edith@example.com")
+        backend = PasswordlessAuthenticationBackend()
+        self.assertIsNotNone(backend.authenticate(token.uid))
+        self.assertIsNone(backend.authenticate(token.uid))
+        self.assertFalse(Token.objects.exists())
+
+    @override_settings(LOGIN_TOKEN_TTL=60)
+    def test_returns_none_if_token_has_expired(self):
+        token: Token = Token.objects.create(
+            email="edith@example.com",
+            created_at=timezone.now() - timedelta(seconds=61),
+        )
+        self.assertIsNone(PasswordlessAuthenticationBackend().authenticate(token.uid))
+        self.assertFalse(User.objects.exists())
+
 
 class GetUserTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_gets_user_by_email(self):
         User.objects.create(email="another@example.com")
         desired_user = User.objects.create(email="edith@example.com")
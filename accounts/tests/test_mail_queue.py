@@ -0,0 +1,149 @@
+import smtplib
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.mail_queue import queue_mail, retry_delay, send_queued_mail
+from accounts.models import QueuedEmail
+
+try:
+    import asyncore
+    import smtpd
+except ImportError:  # removed in Python 3.12
+    smtpd = None
+
+
+def queue(count=1):
+    return [
+        queue_mail("subject", f"body {i}", "noreply@superlists", f"u{i}@example.com")
+        for i in range(count)
+    ]
+
+
+@override_settings(MAIL_QUEUE_BATCH_SIZE=10, MAIL_QUEUE_MAX_ATTEMPTS=3)
+class SendQueuedMailTest(TestCase):
+    def test_sends_due_emails_and_marks_them_sent(self):
+        queue(2)
+        self.assertEqual(send_queued_mail(), 2)
+        self.assertEqual(
+            [m.to for m in mail.outbox], [["u0@example.com"], ["u1@example.com"]]
+        )
+        self.assertEqual(
+            QueuedEmail.objects.filter(status=QueuedEmail.SENT).count(), 2
+        )
+
+    def test_does_not_resend_sent_emails(self):
+        queue()
+        send_queued_mail()
+        self.assertEqual(send_queued_mail(), 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_sends_in_batches(self):
+        queue(3)
+        self.assertEqual(send_queued_mail(batch_size=2), 2)
+        self.assertEqual(send_queued_mail(batch_size=2), 1)
+
+    def test_skips_emails_not_yet_due(self):
+        email, = queue()
+        email.send_after = timezone.now() + timedelta(minutes=1)
+        email.save()
+        self.assertEqual(send_queued_mail(), 0)
+
+    @patch("accounts.mail_queue.EmailMessage.send")
+    def test_failures_are_retried_with_backoff(self, mock_send):
+        mock_send.side_effect = smtplib.SMTPServerDisconnected("gone")
+        email, = queue()
+        send_queued_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.status, QueuedEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("gone", email.last_error)
+        self.assertGreater(email.send_after, timezone.now())
+
+    @patch("accounts.mail_queue.EmailMessage.send")
+    def test_other_errors_are_recorded_and_the_batch_goes_on(self, mock_send):
+        mock_send.side_effect = [UnicodeEncodeError("ascii", "é", 0, 1, "bad"), 1]
+        failed, sent = queue(2)
+        self.assertEqual(send_queued_mail(), 1)
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, QueuedEmail.PENDING)
+        self.assertIn("UnicodeEncodeError", failed.last_error)
+        sent.refresh_from_db()
+        self.assertEqual(sent.status, QueuedEmail.SENT)
+
+    @patch("accounts.mail_queue.EmailMessage.send")
+    def test_sent_emails_are_marked_before_the_next_one_is_sent(self, mock_send):
+        mock_send.side_effect = [1, KeyboardInterrupt]
+        sent, interrupted = queue(2)
+        with self.assertRaises(KeyboardInterrupt):
+            send_queued_mail()
+        sent.refresh_from_db()
+        self.assertEqual(sent.status, QueuedEmail.SENT)
+        interrupted.refresh_from_db()
+        self.assertEqual(interrupted.status, QueuedEmail.PENDING)
+
+    @patch("accounts.mail_queue.EmailMessage.send")
+    def test_gives_up_after_max_attempts(self, mock_send):
+        mock_send.side_effect = smtplib.SMTPServerDisconnected("gone")
+        email, = queue()
+        for _ in range(3):
+            QueuedEmail.objects.update(send_after=timezone.now())
+            send_queued_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.status, QueuedEmail.FAILED)
+
+    @override_settings(MAIL_QUEUE_RETRY_DELAY=30)
+    def test_retry_delay_doubles(self):
+        self.assertEqual(retry_delay(1), timedelta(seconds=30))
+        self.assertEqual(retry_delay(3), timedelta(seconds=120))
+
+    def test_command_sends_everything_due_once(self):
+        queue(3)
+        call_command("send_queued_mail", "--once", "--batch-size=2", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 3)
+
+
+class RecordingSMTPServer(smtpd.SMTPServer if smtpd else object):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), None, decode_data=True)
+        self.connections = 0
+        self.messages = []
+
+    def handle_accepted(self, conn, addr):
+        self.connections += 1
+        super().handle_accepted(conn, addr)
+
+    def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+        self.messages.append(rcpttos)
+
+
+@skipIf(smtpd is None, "needs the smtpd module")
+class SMTPStandInTest(TestCase):
+    def setUp(self):
+        self.server = RecordingSMTPServer()
+        self.thread = threading.Thread(
+            target=asyncore.loop, kwargs={"timeout": 0.05}, daemon=True
+        )
+        self.thread.start()
+        self.addCleanup(self.server.close)
+
+    def test_sends_a_batch_over_one_smtp_connection(self):
+        queue(5)
+        with override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.server.socket.getsockname()[1],
+            EMAIL_HOST_USER="",
+            EMAIL_USE_TLS=False,
+        ):
+            call_command("send_queued_mail", "--once", stdout=StringIO())
+
+        self.assertEqual(len(self.server.messages), 5)
+        self.assertEqual(self.server.connections, 1)
@@ -1,5 +1,11 @@
+from datetime import timedelta
+from io import StringIO
+
 from django.contrib import auth
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from accounts.models import Token
 
@@ -27,3 +33,42 @@ class TokenModelTest(TestCase):
         token1 = Token.objects.create(email="a@b.com")
         token2 = Token.objects.create(email="a@b.com")
         self.assertNotEqual(token1.uid, token2.uid)
+
+    def test_uid_is_unique(self):
+        token = Token.objects.create(email="a@b.com")
+        with self.assertRaises(IntegrityError):
+            Token.objects.create(email="c@d.com", uid=token.uid)
+
+    @override_settings(LOGIN_TOKEN_TTL=60)
+    def test_tokens_older_than_ttl_are_expired(self):
+        fresh = Token.objects.create(email="a@b.com")
+        stale = Token.objects.create(
+            email="a@b.com", created_at=timezone.now() - timedelta(seconds=61)
+        )
+        self.assertEqual(list(Token.objects.valid()), [fresh])
+        self.assertEqual(list(Token.objects.expired()), [stale])
+
+
+@override_settings(LOGIN_TOKEN_TTL=60)
+class PurgeLoginTokensTest(TestCase):
+    def purge(self, *args):
+        call_command("purge_login_tokens", *args, stdout=StringIO())
+
+    def test_deletes_only_expired_tokens(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        Token.objects.bulk_create(
+            Token(email="a@b.com", uid=str(i), created_at=long_ago) for i in range(5)
+        )
+        fresh = Token.objects.create(email="a@b.com")
+        self.purge()
+        self.assertEqual(list(Token.objects.all()), [fresh])
+
+    def test_deletes_in_batches(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        Token.objects.bulk_create(
+            Token(email="a@b.com", uid=str(i), created_at=long_ago) for i in range(5)
+        )
+        # Two full batches, one partial batch: a select and a delete for each
+        with self.assertNumQueries(6):
+            self.purge("--batch-size", "2")
+        self.assertFalse(Token.objects.exists())
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts import urls
+from accounts.models import Token
+from superlists.query_budgets import QueryBudgetMixin
+
+User = get_user_model()
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_every_url_has_a_budget(self):
+        for pattern in urls.urlpatterns:
+            self.assertIn(pattern.name, urls.QUERY_BUDGETS)
+
+    def test_send_login_email(self):
+        self.assertWithinQueryBudget(
+            "post", "/accounts/send_login_email", data={"email": "a@b.com"}
+        )
+
+    def test_login_as_new_user(self):
+        token = Token.objects.create(email="a@b.com")
+        self.assertWithinQueryBudget("get", f"/accounts/login?token={token.uid}")
+
+    def test_login_as_existing_user(self):
+        User.objects.create(email="a@b.com")
+        token = Token.objects.create(email="a@b.com")
+        self.assertWithinQueryBudget("get", f"/accounts/login?token={token.uid}")
+
+    def test_logout(self):
+        self.client.force_login(User.objects.create(email="a@b.com"))
+        self.assertWithinQueryBudget("get", "/accounts/logout")
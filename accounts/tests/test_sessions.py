@@ -0,0 +1,73 @@
+import json
+from contextlib import nullcontext
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+
+from functional_tests.management.commands.create_session import \
+    create_pre_authenticated_session
+
+SESSION_ENGINES = [
+    "django.contrib.sessions.backends.db",
+    "django.contrib.sessions.backends.cached_db",
+    "django.contrib.sessions.backends.cache",
+    "django.contrib.sessions.backends.signed_cookies",
+]
+
+
+class PreAuthenticatedSessionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def assert_logged_in_with(self, session_key, email):
+        # A new client, as middleware picks its session engine when loaded
+        client = Client()
+        client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+        response = client.get("/")
+        self.assertEqual(response.context["user"].email, email)
+
+    def test_session_works_with_every_engine(self):
+        for engine in SESSION_ENGINES:
+            with self.subTest(engine=engine), override_settings(SESSION_ENGINE=engine):
+                email = engine.rsplit(".", 1)[-1] + "@example.com"
+                session_key = create_pre_authenticated_session(email)
+                self.assert_logged_in_with(session_key, email)
+
+    def test_create_session_command_prints_usable_key(self):
+        for engine in SESSION_ENGINES:
+            with self.subTest(engine=engine), override_settings(SESSION_ENGINE=engine):
+                email = engine.rsplit(".", 1)[-1] + "@example.com"
+                stdout = StringIO()
+                call_command("create_session", email, stdout=stdout)
+                self.assert_logged_in_with(stdout.getvalue().strip(), email)
+
+
+# The test runner has already set up a test database
+@patch(
+    "functional_tests.management.commands.bench_sessions.benchmark_database",
+    nullcontext,
+)
+class BenchSessionsCommandTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_reports_every_page_for_each_backend(self):
+        stdout = StringIO()
+        call_command(
+            "bench_sessions",
+            "--requests=2",
+            "--backend=db",
+            "--backend=signed_cookies",
+            stdout=stdout,
+        )
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(list(report["backends"]), ["db", "signed_cookies"])
+        for pages in report["backends"].values():
+            self.assertEqual(list(pages), ["home", "my_lists", "login"])
+            for summary in pages.values():
+                self.assertEqual(summary["requests"], 2)
+                self.assertGreater(summary["throughput_rps"], 0)
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import CacheHandler, cache
+from django.test import TestCase, override_settings
+
+from accounts import user_cache
+
+User = get_user_model()
+
+
+class UserCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_second_lookup_does_not_query(self):
+        user = User.objects.create(email="edith@example.com")
+        self.assertEqual(user_cache.get_user("edith@example.com"), user)
+        with self.assertNumQueries(0):
+            self.assertEqual(user_cache.get_user("edith@example.com"), user)
+
+    def test_missing_user_is_cached(self):
+        self.assertIsNone(user_cache.get_user("edith@example.com"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(user_cache.get_user("edith@example.com"))
+
+    def test_creating_user_clears_cached_miss(self):
+        self.assertIsNone(user_cache.get_user("edith@example.com"))
+        user = User.objects.create(email="edith@example.com")
+        self.assertEqual(user_cache.get_user("edith@example.com"), user)
+
+    def test_deleting_user_clears_cached_user(self):
+        user = User.objects.create(email="edith@example.com")
+        user_cache.get_user("edith@example.com")
+        user.delete()
+        self.assertIsNone(user_cache.get_user("edith@example.com"))
+
+    def test_get_or_create_user_creates_missing_user(self):
+        user = user_cache.get_or_create_user("edith@example.com")
+        self.assertEqual(User.objects.get(), user)
+        self.assertEqual(user_cache.get_or_create_user("edith@example.com"), user)
+
+    def test_change_through_another_cache_instance_is_seen(self):
+        # Another worker process has a cache instance of its own, on the same
+        # shared cache (separate LocMemCache instances share their storage).
+        other_worker_cache = CacheHandler()["default"]
+        self.assertIsNot(other_worker_cache, cache)
+        user = User.objects.create(email="edith@example.com")
+        self.assertEqual(user_cache.get_user("edith@example.com"), user)
+
+        with patch("accounts.user_cache.cache", other_worker_cache):
+            user.delete()
+
+        self.assertIsNone(user_cache.get_user("edith@example.com"))
+
+    @override_settings(USER_CACHE_ENABLED=False)
+    def test_disabled_cache_always_queries(self):
+        user = User.objects.create(email="edith@example.com")
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertEqual(user_cache.get_user("edith@example.com"), user)
+        with self.assertNumQueries(1):
+            self.assertIsNone(user_cache.get_user("nobody@example.com"))
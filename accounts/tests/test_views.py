@@ -2,7 +2,7 @@ from unittest.mock import call, patch
 
 from django.test import TestCase
 
-from accounts.models import Token
+from accounts.models import QueuedEmail, Token
 from accounts.views import TOKEN_FAILURE, TOKEN_SUCCESS
 
 
@@ -20,17 +20,23 @@ class SendLoginEmailViewTest(TestCase):
         token = Token.objects.first()
         self.assertEqual(token.email, "edith@example.com")
 
-    @patch("accounts.views.send_mail")
-    def test_sends_mail_to_address_from_post(self, mock_send_mail):
+    def test_queues_mail_to_address_from_post(self):
         self.client.post(
             "/accounts/send_login_email", data={"email": "edith@example.com"}
         )
 
-        self.assertEqual(mock_send_mail.called, True)
-        (subject, body, from_email, to_list), kwargs = mock_send_mail.call_args
-        self.assertEqual(subject, "Your login link for Superlists")
-        self.assertEqual(from_email, "noreply@superlists")
-        self.assertEqual(to_list, ["edith@example.com"])
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.subject, "Your login link for Superlists")
+        self.assertEqual(email.from_email, "noreply@superlists")
+        self.assertEqual(email.to, "edith@example.com")
+        self.assertEqual(email.status, QueuedEmail.PENDING)
+
+    @patch("accounts.mail_queue.EmailMessage.send")
+    def test_does_not_send_mail_inline(self, mock_send):
+        self.client.post(
+            "/accounts/send_login_email", data={"email": "edith@example.com"}
+        )
+        self.assertFalse(mock_send.called)
 
     def test_adds_success_message(self):
         response = self.client.post(
@@ -45,24 +51,20 @@ class SendLoginEmailViewTest(TestCase):
         )
         self.assertEqual(message.tags, "success")
 
-    @patch("accounts.views.send_mail")
-    def test_sends_link_to_login_using_token_uid(self, mock_send_mail):
+    def test_sends_link_to_login_using_token_uid(self):
         self.client.post(
             "/accounts/send_login_email", data={"email": "edith@example.com"}
         )
 
         token: Token = Token.objects.first()
         expected_url = f"http://testserver/accounts/login?token={token.uid}"
-        (subject, body, from_email, to_list), kwargs = mock_send_mail.call_args
-        self.assertIn(expected_url, body)
+        self.assertIn(expected_url, QueuedEmail.objects.get().body)
 
-    @patch("accounts.views.send_mail")
-    def test_empty_email_doesnt_send_anything(self, mock_send_mail):
+    def test_empty_email_doesnt_send_anything(self):
         self.client.post("/accounts/send_login_email", data={"email": ""})
-        self.assertFalse(mock_send_mail.called)
+        self.assertFalse(QueuedEmail.objects.exists())
 
-    @patch("accounts.views.send_mail")
-    def test_empty_email_returns_error_message(self, mock_send_mail):
+    def test_empty_email_returns_error_message(self):
         response = self.client.post(
             "/accounts/send_login_email", data={"email": ""}, follow=True
         )
@@ -73,8 +75,7 @@ class SendLoginEmailViewTest(TestCase):
         )
         self.assertEqual(message.tags, "error")
 
-    @patch("accounts.views.send_mail")
-    def test_invalid_email_returns_error_message(self, mock_send_mail):
+    def test_invalid_email_returns_error_message(self):
         response = self.client.post(
             "/accounts/send_login_email", data={"email": "123f"}, follow=True
         )
@@ -12,3 +12,10 @@ urlpatterns = [
     url(r"^login$", views.LoginView.as_view(), name="login"),
     url(r"^logout$", logout, {"next_page": "/"}, name="logout"),
 ]
+
+# Most queries per request; checked by the tests with superlists.query_budgets
+QUERY_BUDGETS = {
+    "send_login_email": 2,
+    "login": 11,
+    "logout": 4,
+}
@@ -0,0 +1,52 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+
+# Cached in place of a user that doesn't exist, so repeated lookups of a
+# deleted account don't each go to the database.
+_NO_USER = "no-such-user"
+
+
+def cache_key(email):
+    return "user:" + hashlib.md5(email.encode()).hexdigest()
+
+
+def get_user(email):
+    """The ``User`` with this email, or ``None``, from the cache if possible."""
+    if not settings.USER_CACHE_ENABLED:
+        return User.objects.filter(email=email).first()
+    key = cache_key(email)
+    user = cache.get(key)
+    if user == _NO_USER:
+        return None
+    if user is not None:
+        return user
+    try:
+        user = User.objects.get(email=email)
+    except User.DoesNotExist:
+        cache.set(key, _NO_USER, settings.USER_CACHE_MISS_TIMEOUT)
+        return None
+    cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def get_or_create_user(email):
+    user = get_user(email)
+    if user is None:
+        user = User.objects.create(email=email)
+    return user
+
+
+def forget_user(email):
+    cache.delete(cache_key(email))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_changed_user(sender, instance, **kwargs):
+    forget_user(instance.email)
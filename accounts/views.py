@@ -1,13 +1,14 @@
 from django.contrib import auth, messages
 from django.core.handlers.wsgi import WSGIRequest
-from django.core.mail import send_mail
 from django.urls import reverse
 from django.views.generic import RedirectView
 from django.views.generic.edit import ModelFormMixin
 
 
 from accounts.forms import LoginForm
+from accounts.mail_queue import queue_mail
 from accounts.models import Token
+from superlists.routers import record_write
 
 TOKEN_SUCCESS = "Check your email, we've sent you a link you can use to log in."
 TOKEN_FAILURE = "Please enter a valid email address."
@@ -28,11 +29,11 @@ class SendLoginEmailView(ModelFormMixin, RedirectView):
                 reverse("login") + "?token=" + str(self.object.uid)
             )
             message_body = f"Use this link to log in:\n\n{url}"
-            send_mail(
+            queue_mail(
                 "Your login link for Superlists",
                 message_body,
                 "noreply@superlists",
-                [email],
+                email,
             )
             messages.success(request, TOKEN_SUCCESS)
         else:
@@ -47,5 +48,7 @@ class LoginView(RedirectView):
     def get_redirect_url(self, *args, **kwargs):
         user = auth.authenticate(uid=self.request.GET.get("token"))
         if user:
+            # Logging in used up the token and may have created the user
+            record_write()
             auth.login(self.request, user)
         return super().get_redirect_url(*args, **kwargs)
@@ -16,6 +16,7 @@ def deploy():
         _create_or_update_dotenv()
         _update_static_files()
         _update_database()
+        _update_gunicorn_config()
 
 
 def _get_latest_source():
@@ -37,6 +38,11 @@ def _update_venv():
 def _create_or_update_dotenv():
     append(".env", "DJANGO_DEBUG_FALSE=y")
     append(".env", f"SITENAME={env.host}")
+    # Shared by every gunicorn worker; see deploy_tools/provisioning_notes.md
+    append(".env", "DJANGO_MEMCACHED=127.0.0.1:11211")
+    # Each gunicorn worker writes its metrics here, for /metrics to add up
+    run("mkdir -p metrics")
+    append(".env", f"DJANGO_METRICS_DIR=/home/{env.user}/sites/{env.host}/metrics")
     current_contents = run("cat .env")
     if "DJANGO_SECRET_KEY" not in current_contents:
         new_secret = "".join(
@@ -53,3 +59,13 @@ def _update_static_files():
 
 def _update_database():
     run("./venv/bin/python manage.py migrate --noinput")
+
+
+def _update_gunicorn_config():
+    # Sized from this server's CPUs and memory; the choices are recorded at
+    # the top of the file. Restart gunicorn to apply them.
+    run(
+        "./venv/bin/python deploy_tools/gunicorn_config.py "
+        f"--bind unix:/tmp/{env.host}.socket > gunicorn.conf.py"
+    )
+    run("head -n 2 gunicorn.conf.py")
@@ -0,0 +1,170 @@
+"""Write a gunicorn config sized for the host it runs on.
+
+Run on the server by ``fab deploy``:
+
+    python deploy_tools/gunicorn_config.py --bind unix:/tmp/DOMAIN.socket \\
+        > gunicorn.conf.py
+
+The generated file starts with the host's CPU and memory figures and the
+numbers chosen from them, to compare against ``manage.py bench`` results
+when tuning. Every choice can be overridden with an option.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from datetime import datetime, timezone
+
+# Resident memory of one worker with the app loaded, and how much of the
+# host's memory gunicorn may use (nginx, the mail worker and the page cache
+# SQLite relies on need the rest).
+WORKER_MEMORY_MB = 80
+MEMORY_SHARE = 0.5
+MAX_THREADS = 4
+
+CONFIG_TEMPLATE = """\
+# Generated by deploy_tools/gunicorn_config.py; changes will be overwritten.
+# choices: {choices}
+
+bind = {bind!r}
+workers = {workers}
+worker_class = {worker_class!r}
+threads = {threads}
+
+# Import the app once in the master, so workers start fast and share memory
+preload_app = True
+
+# Recycle workers now and then, staggered so they don't all restart at once
+max_requests = {max_requests}
+max_requests_jitter = {max_requests_jitter}
+
+timeout = {timeout}
+graceful_timeout = {graceful_timeout}
+
+
+def on_starting(server):
+    # Drop the metrics of the previous run's workers; see superlists/metrics.py
+    import glob
+    import os
+
+    metrics_dir = os.environ.get("DJANGO_METRICS_DIR")
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "*")):
+            os.remove(path)
+
+
+def worker_exit(server, worker):
+    # Workers only write their metrics now and then; write what's left
+    from django.conf import settings
+
+    if settings.METRICS_DIR:
+        from superlists.metrics import write_snapshot
+
+        write_snapshot(settings.METRICS_DIR)
+
+
+def child_exit(server, worker):
+    # In the master: keep the exited worker's metrics in one shared file
+    from django.conf import settings
+
+    if settings.METRICS_DIR:
+        from superlists.metrics import fold_exited
+
+        fold_exited(settings.METRICS_DIR, worker.pid)
+
+
+def post_fork(server, worker):
+    # Database connections opened while preloading belong to the master;
+    # each worker must open its own.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    # The rest of the warm-up ran in the master, which stays off the database,
+    # and is inherited. Connections are per thread: open them on the threads
+    # that will serve requests.
+    from django.conf import settings
+
+    if settings.WARM_UP_ON_LOAD:
+        from superlists import warmup
+
+        if getattr(worker, "tpool", None) is None:
+            warmup.open_connections()
+        else:
+            warmup.open_connections_in(worker.tpool, worker.cfg.threads)
+"""
+
+
+def memory_mb():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2 ** 20
+
+
+def choose(cpus, memory, worker_memory=WORKER_MEMORY_MB):
+    """Workers and threads for ``cpus`` CPUs and ``memory`` MB of RAM.
+
+    Aims for the usual 2 * CPUs + 1 workers, and at least 2. Where memory
+    can't hold that many, fewer workers run more threads each to keep the
+    same concurrency. There are always at least 2 threads, so one slow
+    request doesn't block a worker; the config is then gthread, and only
+    ``--threads 1`` gives sync workers.
+    """
+    wanted = 2 * cpus + 1
+    fit = int(memory * MEMORY_SHARE // worker_memory)
+    workers = max(min(wanted, fit), 2)
+    threads = min(math.ceil(wanted / workers) + 1, MAX_THREADS)
+    return workers, threads
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bind", required=True)
+    parser.add_argument("--cpus", type=int, default=os.cpu_count())
+    parser.add_argument("--memory-mb", type=int, default=memory_mb())
+    parser.add_argument("--worker-memory-mb", type=int, default=WORKER_MEMORY_MB)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--max-requests", type=int, default=1000)
+    parser.add_argument("--max-requests-jitter", type=int, default=100)
+    parser.add_argument("--timeout", type=int, default=30)
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    workers, threads = choose(args.cpus, args.memory_mb, args.worker_memory_mb)
+    workers = args.workers or workers
+    threads = args.threads or threads
+    choices = {
+        "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "cpus": args.cpus,
+        "memory_mb": args.memory_mb,
+        "worker_memory_mb": args.worker_memory_mb,
+        "workers": workers,
+        "threads": threads,
+    }
+    sys.stdout.write(
+        CONFIG_TEMPLATE.format(
+            choices=json.dumps(choices),
+            bind=args.bind,
+            workers=workers,
+            # Sync workers can't use threads
+            worker_class="gthread" if threads > 1 else "sync",
+            threads=threads,
+            max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+            timeout=args.timeout,
+            graceful_timeout=args.graceful_timeout,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
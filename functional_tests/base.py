@@ -4,9 +4,9 @@ from datetime import datetime
 
 from django.conf import settings
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
-from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
 
+from functional_tests.browsers import pool
 from functional_tests.management.commands.create_session import \
     create_pre_authenticated_session
 from functional_tests.server_tools import create_session_on_server, reset_database
@@ -33,7 +33,7 @@ def wait(fn):
 
 class FunctionalTest(StaticLiveServerTestCase):
     def setUp(self) -> None:
-        self.browser = webdriver.Firefox()
+        self.browser = self.open_browser()
         self.staging_server = os.environ.get("STAGING_SERVER")
         if self.staging_server:
             self.live_server_url = "http://" + self.staging_server
@@ -48,9 +48,15 @@ class FunctionalTest(StaticLiveServerTestCase):
                 self.browser.switch_to.window(handle)
                 self.take_screenshot()
                 self.dump_html()
-        self.browser.quit()
         super().tearDown()
 
+    def open_browser(self):
+        """A clean browser from the pool, given back when the test ends."""
+        browser = pool.acquire()
+        # setUp may still point live_server_url at a staging server
+        self.addCleanup(lambda: pool.release(browser, self.live_server_url))
+        return browser
+
     def _test_has_failed(self):
         # slightly obscure but couldn't find a better way!
         return any(error for (method, error) in self._outcome.errors)
@@ -0,0 +1,54 @@
+"""Helpers shared by the benchmark management commands."""
+import math
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import (CaptureQueriesContext, setup_test_environment,
+                               teardown_test_environment)
+
+
+@contextmanager
+def benchmark_database():
+    """Run against a throwaway test database instead of the real one."""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timed_request(client, method, path, **kwargs):
+    """Make a request, returning its response, time in ms and query count."""
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = getattr(client, method)(path, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+    return response, elapsed, len(queries)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(timings, query_counts, elapsed=None):
+    """Latency percentiles and mean queries of requests timed in ms.
+
+    Throughput is only reported given the wall-clock ``elapsed`` seconds the
+    requests took, since it also counts the time between them.
+    """
+    summary = {"requests": len(timings)}
+    if elapsed is not None:
+        summary["throughput_rps"] = round(len(timings) / elapsed, 1)
+    summary.update(
+        p50_ms=round(percentile(timings, 50), 3),
+        p95_ms=round(percentile(timings, 95), 3),
+        p99_ms=round(percentile(timings, 99), 3),
+        queries=round(sum(query_counts) / len(query_counts), 2),
+    )
+    return summary
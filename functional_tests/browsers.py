@@ -0,0 +1,82 @@
+"""A pool of headless Firefox instances reused across functional tests.
+
+Starting Firefox takes far longer than most tests, so browsers are started
+on demand and reused; between tests each one is reset to a single blank
+window with no cookies or storage. The test runner
+(``functional_tests.runner``) closes the pool when the run ends, or, in each
+process of a ``manage.py test --parallel`` run, after each test case class.
+
+Set ``HEADLESS=0`` to watch the browsers, and ``FT_REUSE_BROWSERS=0`` to
+start a fresh browser for every test.
+"""
+import os
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+
+def start_browser():
+    options = webdriver.FirefoxOptions()
+    if os.environ.get("HEADLESS", "1") != "0":
+        options.add_argument("-headless")
+    return webdriver.Firefox(options=options)
+
+
+def quit_if_possible(browser):
+    try:
+        browser.quit()
+    except Exception:
+        pass
+
+
+def reset_browser(browser, site_url):
+    """Leave ``browser`` with one blank window and no cookies or storage.
+
+    ``site_url`` is the site the test used: cookies and storage can only be
+    cleared from one of its pages, whichever page the test ended on.
+    """
+    for handle in browser.window_handles[1:]:
+        browser.switch_to.window(handle)
+        browser.close()
+    browser.switch_to.window(browser.window_handles[0])
+    # 404 pages load the quickest
+    browser.get(site_url + "/404_no_such_url")
+    browser.delete_all_cookies()
+    browser.execute_script("window.localStorage.clear();")
+    browser.execute_script("window.sessionStorage.clear();")
+    browser.get("about:blank")
+
+
+class BrowserPool(object):
+    def __init__(self, reuse=True):
+        self.reuse = reuse
+        self._idle = []
+        self._started = []
+
+    def acquire(self):
+        if self._idle:
+            return self._idle.pop()
+        browser = start_browser()
+        self._started.append(browser)
+        return browser
+
+    def release(self, browser, site_url):
+        if self.reuse:
+            try:
+                reset_browser(browser, site_url)
+            except WebDriverException:
+                pass  # Broken by the test; replace it
+            else:
+                self._idle.append(browser)
+                return
+        self._started.remove(browser)
+        quit_if_possible(browser)
+
+    def close(self):
+        for browser in self._started:
+            quit_if_possible(browser)
+        self._idle.clear()
+        self._started.clear()
+
+
+pool = BrowserPool(reuse=os.environ.get("FT_REUSE_BROWSERS", "1") != "0")
@@ -0,0 +1,126 @@
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import Token
+from functional_tests.benchmarking import benchmark_database, summarize, timed_request
+from functional_tests.seeding import seed
+from lists.models import List
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and time requests to every view, reporting "
+        "throughput, latency percentiles and queries per view as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--lists-per-user", type=int, default=5)
+        parser.add_argument("--items-per-list", type=int, default=20)
+        parser.add_argument("--sharees", type=int, default=2)
+        parser.add_argument(
+            "--requests", type=int, default=100, help="Requests per view."
+        )
+        parser.add_argument(
+            "--view",
+            action="append",
+            dest="views",
+            help="Only time this view (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        dataset = {
+            name: options[name]
+            for name in ("users", "lists_per_user", "items_per_list", "sharees")
+        }
+        if dataset["users"] < 2 or dataset["lists_per_user"] < 1:
+            raise CommandError("Need at least 2 users with a list each.")
+        with benchmark_database():
+            seed(**dataset)
+            scenarios = self.scenarios()
+            unknown = set(options["views"] or []) - set(scenarios)
+            if unknown:
+                raise CommandError(f"Unknown views: {', '.join(sorted(unknown))}")
+            results = {
+                name: self.run(name, scenario, options["requests"])
+                for name, scenario in scenarios.items()
+                if not options["views"] or name in options["views"]
+            }
+        report = {"dataset": dataset, "views": results}
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def scenarios(self):
+        """Functions of the request number returning a request to make.
+
+        Each returns a ``(client, method, path, kwargs)`` tuple; any setup
+        they do isn't timed.
+        """
+        user = User.objects.get(email="user0@example.com")
+        other = User.objects.get(email="user1@example.com")
+        owned = list(List.objects.filter(owner=user))
+        logged_in = Client()
+        logged_in.force_login(user)
+        anonymous = Client()
+
+        def view_list(n):
+            list_ = owned[n % len(owned)]
+            return logged_in, "get", reverse("view_list", args=[list_.id]), {}
+
+        def add_item(n):
+            list_ = owned[n % len(owned)]
+            path = reverse("view_list", args=[list_.id])
+            return logged_in, "post", path, {"data": {"text": f"bench item {n}"}}
+
+        def share_list(n):
+            list_ = owned[n % len(owned)]
+            path = reverse("share_list", args=[list_.id])
+            return logged_in, "post", path, {"data": {"shared_with": other.email}}
+
+        def login(n):
+            token = Token.objects.create(email=user.email)
+            return Client(), "get", reverse("login"), {"data": {"token": token.uid}}
+
+        return {
+            "home": lambda n: (anonymous, "get", reverse("home"), {}),
+            "new_list": lambda n: (
+                logged_in,
+                "post",
+                reverse("new_list"),
+                {"data": {"text": f"bench list {n}"}},
+            ),
+            "view_list": view_list,
+            "add_item": add_item,
+            "my_lists": lambda n: (
+                logged_in,
+                "get",
+                reverse("my_lists", args=[user.email]),
+                {},
+            ),
+            "share_list": share_list,
+            "send_login_email": lambda n: (
+                anonymous,
+                "post",
+                reverse("send_login_email"),
+                {"data": {"email": user.email}},
+            ),
+            "login": login,
+        }
+
+    def run(self, name, scenario, requests):
+        timings, query_counts = [], []
+        start = time.perf_counter()
+        for n in range(requests):
+            client, method, path, kwargs = scenario(n)
+            response, elapsed, queries = timed_request(client, method, path, **kwargs)
+            if response.status_code >= 400:
+                raise CommandError(f"{name}: {path} returned {response.status_code}")
+            timings.append(elapsed)
+            query_counts.append(queries)
+        return summarize(timings, query_counts, time.perf_counter() - start)
@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+# The suite as it used to run -- a new Firefox per test, one test at a time --
+# against pooled headless browsers shared by parallel workers.  Each worker
+# process gets its own live server (on a free port) and its own copy of the
+# in-memory test database.
+RUNS = {
+    "serial_fresh_browsers": ({"FT_REUSE_BROWSERS": "0"}, 1),
+    "parallel_pooled_browsers": ({"FT_REUSE_BROWSERS": "1"}, None),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the functional test suite serially with a new browser per test, "
+        "then in parallel with pooled headless browsers, as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("labels", nargs="*", default=["functional_tests"])
+        parser.add_argument(
+            "--parallel",
+            type=int,
+            default=os.cpu_count(),
+            help="Worker processes for the pooled run.",
+        )
+
+    def handle(self, *args, **options):
+        report = {}
+        for name, (env, workers) in RUNS.items():
+            workers = workers or options["parallel"]
+            seconds, passed = self.run_suite(options["labels"], env, workers)
+            report[name] = {
+                "workers": workers,
+                "seconds": round(seconds, 1),
+                "passed": passed,
+            }
+        report["speedup"] = round(
+            report["serial_fresh_browsers"]["seconds"]
+            / report["parallel_pooled_browsers"]["seconds"],
+            2,
+        )
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run_suite(self, labels, env, workers):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "manage.py", "test", *labels, "--parallel", str(workers)],
+            cwd=settings.BASE_DIR,
+            env=dict(os.environ, HEADLESS="1", **env),
+        )
+        return time.perf_counter() - start, result.returncode == 0
@@ -0,0 +1,69 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from accounts.models import Token
+from functional_tests.benchmarking import benchmark_database, summarize, timed_request
+from functional_tests.management.commands.create_session import \
+    create_pre_authenticated_session
+
+BACKENDS = ["db", "cached_db", "cache", "signed_cookies"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare request latency and queries across session backends, as JSON "
+        "keyed by backend and page."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--backend",
+            action="append",
+            choices=BACKENDS,
+            dest="backends",
+            help="Backend to measure (repeatable); defaults to all of them.",
+        )
+
+    def handle(self, *args, **options):
+        results = {}
+        with benchmark_database():
+            for backend in options["backends"] or BACKENDS:
+                engine = "django.contrib.sessions.backends." + backend
+                with override_settings(SESSION_ENGINE=engine):
+                    results[backend] = self.measure(backend, options["requests"])
+        report = {"requests": options["requests"], "backends": results}
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def measure(self, backend, requests):
+        email = f"bench-{backend}@example.com"
+        client = Client()
+        session_key = create_pre_authenticated_session(email)
+        client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+
+        def login():
+            # Logging in writes a fresh session every time
+            token = Token.objects.create(email=email)
+            return Client(), "get", reverse("login"), {"data": {"token": token.uid}}
+
+        pages = {
+            "home": lambda: (client, "get", "/", {}),
+            "my_lists": lambda: (client, "get", reverse("my_lists", args=[email]), {}),
+            "login": login,
+        }
+        return {page: self.run(request, requests) for page, request in pages.items()}
+
+    def run(self, request, requests):
+        timings, query_counts = [], []
+        start = time.perf_counter()
+        for _ in range(requests):
+            client, method, path, kwargs = request()
+            _, elapsed, queries = timed_request(client, method, path, **kwargs)
+            timings.append(elapsed)
+            query_counts.append(queries)
+        return summarize(timings, query_counts, time.perf_counter() - start)
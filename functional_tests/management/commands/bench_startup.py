@@ -0,0 +1,163 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from functional_tests.benchmarking import percentile
+
+# Run in a fresh interpreter: time importing the WSGI app (which sets Django
+# up) and serving its first request, as a new gunicorn worker would. Then, as
+# in a gthread worker after post_worker_init, time each of a pool of threads'
+# first query on a scratch database, which includes connecting unless the
+# warm-up connected the thread already.
+COLD_START_SCRIPT = """
+import json, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+start = time.perf_counter()
+from superlists.wsgi import application
+imported = time.perf_counter()
+
+environ = {"HTTP_HOST": "localhost", "PATH_INFO": "/"}
+setup_testing_defaults(environ)
+statuses = []
+body = b"".join(application(environ, lambda status, headers: statuses.append(status)))
+served = time.perf_counter()
+
+from django.conf import settings
+from django.db import connection
+from superlists import warmup
+
+threads, settings.DATABASES["default"]["NAME"] = int(sys.argv[1]), sys.argv[2]
+pool = ThreadPoolExecutor(threads)
+connect_ms = None
+if settings.WARM_UP_ON_LOAD:
+    connect_start = time.perf_counter()
+    warmup.open_connections_in(pool, threads)
+    connect_ms = (time.perf_counter() - connect_start) * 1000
+
+barrier = threading.Barrier(threads)
+
+def first_query(_):
+    barrier.wait()  # One query per thread
+    query_start = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return (time.perf_counter() - query_start) * 1000
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (served - imported) * 1000,
+    "connect_ms": connect_ms,
+    "first_query_ms": list(pool.map(first_query, range(threads))),
+    "status": statuses[0],
+    "modules": len(sys.modules),
+    "test_modules": sorted(
+        name
+        for name in ("functional_tests", "selenium", "fabric")
+        if name in sys.modules
+    ),
+}))
+"""
+
+PROFILE_ENV = {
+    "development": {},
+    "production": {
+        "DJANGO_DEBUG_FALSE": "y",
+        "DJANGO_SECRET_KEY": "bench-startup",
+        "SITENAME": "localhost",
+    },
+}
+PROFILE_ENV["production-warm-up"] = dict(PROFILE_ENV["production"], DJANGO_WARM_UP="y")
+
+
+class Command(BaseCommand):
+    help = (
+        "Time importing superlists.wsgi and serving the first request in new "
+        "processes, as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--runs", type=int, default=10)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Request threads per worker, as in the gunicorn config.",
+        )
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=sorted(PROFILE_ENV),
+            dest="profiles",
+            help="Settings profile to start (repeatable); defaults to all.",
+        )
+
+    def handle(self, *args, **options):
+        report = {}
+        with tempfile.TemporaryDirectory() as static_root:
+            database = os.path.join(static_root, "db.sqlite3")
+            for profile in options["profiles"] or sorted(PROFILE_ENV):
+                env = self.environment(profile, static_root)
+                if profile.startswith("production"):
+                    # Manifest storage can't render pages before collectstatic
+                    self.manage(env, "collectstatic", "--noinput", "-v0")
+                runs = [
+                    self.cold_start(env, options["threads"], database)
+                    for _ in range(options["runs"])
+                ]
+                report[profile] = self.summarize(runs)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def environment(self, profile, static_root):
+        env = dict(os.environ, **PROFILE_ENV[profile], DJANGO_STATIC_ROOT=static_root)
+        # As the web server would start, not as manage.py does
+        env.pop("DJANGO_TEST_TOOLS", None)
+        return env
+
+    def manage(self, env, *args):
+        subprocess.run(
+            [sys.executable, "manage.py", *args],
+            cwd=settings.BASE_DIR,
+            env=env,
+            check=True,
+        )
+
+    def cold_start(self, env, threads, database):
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_START_SCRIPT, str(threads), database],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        return json.loads(result.stdout)
+
+    def summarize(self, runs):
+        summary = {"runs": len(runs)}
+        samples = {
+            "import_ms": [run["import_ms"] for run in runs],
+            "first_request_ms": [run["first_request_ms"] for run in runs],
+            # Every thread of every run
+            "first_query_ms": [ms for run in runs for ms in run["first_query_ms"]],
+        }
+        if runs[0]["connect_ms"] is not None:
+            samples["connect_ms"] = [run["connect_ms"] for run in runs]
+        for timing, values in samples.items():
+            summary[timing] = {
+                "p50": round(percentile(values, 50), 1),
+                "p95": round(percentile(values, 95), 1),
+                "p99": round(percentile(values, 99), 1),
+            }
+        last = runs[-1]
+        summary.update(
+            status=last["status"],
+            modules=last["modules"],
+            test_modules=last["test_modules"],
+        )
+        return summary
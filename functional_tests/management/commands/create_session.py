@@ -1,6 +1,7 @@
+from importlib import import_module
+
 from django.conf import settings
 from django.contrib.auth import BACKEND_SESSION_KEY, SESSION_KEY, get_user_model
-from django.contrib.sessions.backends.db import SessionStore
 from django.core.management.base import BaseCommand, CommandParser
 
 User = get_user_model()
@@ -17,6 +18,8 @@ class Command(BaseCommand):
 
 def create_pre_authenticated_session(email):
     user = User.objects.create(email=email)
+    # Whichever session engine is configured, so the key works with it
+    SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
     session = SessionStore()
     session[SESSION_KEY] = user.pk
     session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
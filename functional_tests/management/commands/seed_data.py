@@ -0,0 +1,45 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from functional_tests.seeding import seed
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Fill the database with generated users, lists, items and shares."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--lists-per-user", type=int, default=100)
+        parser.add_argument("--items-per-list", type=int, default=10)
+        parser.add_argument("--sharees", type=int, default=3)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed; seeding an empty database with it gives the same data.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if User.objects.filter(email="user0@example.com").exists():
+            raise CommandError("The database has already been seeded.")
+        start = time.perf_counter()
+        counts = seed(
+            users=options["users"],
+            lists_per_user=options["lists_per_user"],
+            items_per_list=options["items_per_list"],
+            sharees=options["sharees"],
+            random_seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        elapsed = time.perf_counter() - start
+        rows = sum(counts.values())
+        for model, count in sorted(counts.items()):
+            self.stdout.write(f"{model}: {count}")
+        self.stdout.write(
+            f"{rows} rows in {elapsed:.1f}s ({rows / elapsed * 60:,.0f} rows/minute)"
+        )
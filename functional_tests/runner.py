@@ -0,0 +1,36 @@
+"""A test runner that closes the functional tests' browsers.
+
+The browsers are closed by the runner rather than at exit because the worker
+processes of a ``--parallel`` run leave with ``os._exit``, which skips
+``atexit`` handlers. The browser pool is only looked up once a test has
+imported it, so running the unit tests doesn't need selenium.
+"""
+import sys
+
+from django.test.runner import DiscoverRunner, ParallelTestSuite, _run_subsuite
+
+
+def close_browsers():
+    browsers = sys.modules.get("functional_tests.browsers")
+    if browsers is not None:
+        browsers.pool.close()
+
+
+def _run_subsuite_and_close_browsers(args):
+    # A subsuite is one test case class, run in a worker process
+    try:
+        return _run_subsuite(args)
+    finally:
+        close_browsers()
+
+
+class BrowserClosingParallelTestSuite(ParallelTestSuite):
+    run_subsuite = _run_subsuite_and_close_browsers
+
+
+class TestRunner(DiscoverRunner):
+    parallel_test_suite = BrowserClosingParallelTestSuite
+
+    def teardown_test_environment(self, **kwargs):
+        close_browsers()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,80 @@
+"""Build datasets for benchmarks and load tests."""
+import random
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max
+
+from lists.models import Item, List
+
+User = get_user_model()
+
+VERBS = [
+    "Buy", "Fix", "Call", "Email", "Book", "Pack", "Clean", "Return", "Plan", "Read",
+]  # fmt: skip
+THINGS = [
+    "milk", "peacock feathers", "the car", "mum", "dentist", "flights", "tent",
+    "library books", "garage", "birthday party", "bread", "fishing net", "bills",
+    "bike", "tickets", "the report", "groceries", "paint", "passport", "plants",
+]  # fmt: skip
+
+Share = List.shared_with.through
+
+
+def item_text(rng, number):
+    # Numbered, as a list can't have the same item twice
+    return f"{rng.choice(VERBS)} {rng.choice(THINGS)} ({number})"
+
+
+def seed(
+    users=20,
+    lists_per_user=5,
+    items_per_list=20,
+    sharees=2,
+    random_seed=0,
+    batch_size=5000,
+):
+    """Create ``users`` users, each owning ``lists_per_user`` lists.
+
+    Every list has ``items_per_list`` items and is shared with ``sharees``
+    other users picked at random. The same ``random_seed`` gives the same
+    data. Rows are inserted with ``bulk_create`` in transactions of about
+    ``batch_size`` rows; lists get explicit ids so their items and shares
+    can be built without reading them back. Returns row counts by model.
+    """
+    rng = random.Random(random_seed)
+    sharees = min(sharees, users - 1)
+    emails = [f"user{n}@example.com" for n in range(users)]
+    counts = Counter()
+    with transaction.atomic():
+        User.objects.bulk_create(User(email=email) for email in emails)
+    counts["user"] = users
+
+    pending = {List: [], Item: [], Share: []}
+
+    def flush():
+        with transaction.atomic():
+            for model, rows in pending.items():
+                # Django picks how many rows fit in one INSERT
+                model.objects.bulk_create(rows)
+                counts[model._meta.model_name] += len(rows)
+                rows.clear()
+
+    list_id = List.objects.aggregate(Max("id"))["id__max"] or 0
+    for n, email in enumerate(emails):
+        for _ in range(lists_per_user):
+            list_id += 1
+            texts = [item_text(rng, number) for number in range(items_per_list)]
+            pending[List].append(
+                List(id=list_id, owner_id=email, name=texts[0] if texts else "")
+            )
+            pending[Item].extend(Item(list_id=list_id, text=text) for text in texts)
+            for other in rng.sample(range(users - 1), sharees):
+                # Skip over the owner
+                sharee = emails[other if other < n else other + 1]
+                pending[Share].append(Share(list_id=list_id, user_id=sharee))
+        if len(pending[Item]) + len(pending[List]) >= batch_size:
+            flush()
+    flush()
+    return counts
@@ -6,6 +6,7 @@ import time
 from email.header import decode_header
 
 from django.core import mail
+from django.core.management import call_command
 from selenium.webdriver.common.keys import Keys
 
 from functional_tests.base import FunctionalTest
@@ -16,6 +17,7 @@ SUBJECT = "Your login link for Superlists"
 class LoginTest(FunctionalTest):
     def wait_for_email(self, test_email, subject):
         if not self.staging_server:
+            call_command("send_queued_mail", "--once")
             email_fake = mail.outbox[0]
             self.assertIn(test_email, email_fake.to)
             self.assertEqual(email_fake.subject, subject)
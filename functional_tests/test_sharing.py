@@ -1,17 +1,8 @@
-from selenium import webdriver
-
 from functional_tests.base import FunctionalTest
 from functional_tests.pages.list_page import ListPage
 from functional_tests.pages.my_lists_page import MyListsPage
 
 
-def quit_if_possible(browser: webdriver.Firefox):
-    try:
-        browser.quit()
-    except Exception:
-        pass
-
-
 class SharingTest(FunctionalTest):
     def test_can_share_a_list_with_another_user(self):
         # Edith is a logged-in user
@@ -19,8 +10,7 @@ class SharingTest(FunctionalTest):
         edith_browser = self.browser
 
         # Her friend Oniciferous is also hanging out on the lists site
-        oni_browser = webdriver.Firefox()
-        self.addCleanup(lambda: quit_if_possible(oni_browser))
+        oni_browser = self.open_browser()
         self.browser = oni_browser
 
         self.create_pre_authenticated_session("oniciferous@example.com")
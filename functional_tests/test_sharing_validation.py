@@ -1,4 +1,3 @@
-from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
 
 from functional_tests.base import FunctionalTest
@@ -9,11 +8,9 @@ class SharingValidationTest(FunctionalTest):
     def test_invalid_form_input(self):
         # Edith is a long-time user of superlists
         self.create_pre_authenticated_session("edith@example.com")
-        edith_browser = self.browser
-        edith_browser.quit()
 
         # A new (anonymous) user just created a list
-        self.browser = webdriver.Firefox()
+        self.browser = self.open_browser()
         self.browser.get(self.live_server_url)
         list_page = ListPage(self).add_list_item("Interesting...")
 
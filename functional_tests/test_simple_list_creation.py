@@ -1,5 +1,3 @@
-from selenium import webdriver
-
 from functional_tests.base import FunctionalTest
 from functional_tests.pages.list_page import ListPage
 
@@ -48,8 +46,7 @@ class NewVisitorTest(FunctionalTest):
 
         # # We use a new browser session to make sure that no information
         # # of Edith's is coming through from cookies etc
-        self.browser.quit()
-        self.browser = webdriver.Firefox()
+        self.browser = self.open_browser()
 
         # Francis visits the home page. There is no sign of Edith's list
         self.browser.get(self.live_server_url)
@@ -1,10 +1,24 @@
+import re
+
 from django import forms
 from django.contrib.auth import get_user_model
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
 
+from lists.identity_map import IdentityMap
 from lists.models import Item, List
 
 EMPTY_ITEM_ERROR = "You can't have an empty list item"
 DUPLICATE_ITEM_ERROR = "You've already got this in your list"
+EMPTY_BULK_ITEMS_ERROR = "You can't add an empty batch of items"
+TOO_MANY_BULK_ITEMS_ERROR = "You can add at most {max_lines} items at once"
+CONCURRENT_BULK_ITEMS_ERROR = "Some of these items were just added, please try again"
+BULK_ITEMS_MAX_LINES = 10000
+# Stays under SQLite's default limit of 999 parameters per query
+BULK_ITEMS_LOOKUP_BATCH_SIZE = 500
+USER_DOES_NOT_EXIST_ERROR = "This user does not exist."
+TOO_MANY_EMAILS_ERROR = "You can share a list with at most {max_emails} people at once"
+SHARE_MAX_EMAILS = 500
 
 User = get_user_model()
 
@@ -40,11 +54,120 @@ class ExistingListItemForm(ItemForm):
         self.instance.list = for_list
 
     def validate_unique(self) -> None:
+        # Rather than checking for a duplicate and then inserting, save() inserts
+        # right away and lets the unique constraint decide. That's one query
+        # instead of two, and two people adding the same item at once can't
+        # both pass.
+        pass
+
+    def save(self, commit=True):
+        """Insert the item, or return None and add an error if it's a duplicate."""
+        if self.errors:
+            raise ValueError("The item could not be saved: " + str(self.errors))
+        if not commit:
+            return self.instance
+        try:
+            with transaction.atomic():
+                self.instance.save()
+        except IntegrityError:
+            self.instance.pk = None
+            self.add_error("text", DUPLICATE_ITEM_ERROR)
+            return None
+        return self.instance
+
+
+class BulkItemsForm(forms.Form):
+    items = forms.CharField(
+        widget=forms.widgets.Textarea(
+            attrs={
+                "placeholder": "Paste to-do items, one per line",
+                "class": "form-control",
+                "rows": 4,
+            }
+        ),
+        error_messages={"required": EMPTY_BULK_ITEMS_ERROR},
+    )
+
+    def __init__(self, for_list, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.list = for_list
+        self.skipped = []
+        self.repeated = []
+
+    def clean_items(self):
+        lines = [line.strip() for line in self.cleaned_data["items"].splitlines()]
+        lines = [line for line in lines if line]
+        if not lines:
+            raise forms.ValidationError(EMPTY_BULK_ITEMS_ERROR)
+        if len(lines) > BULK_ITEMS_MAX_LINES:
+            raise forms.ValidationError(
+                TOO_MANY_BULK_ITEMS_ERROR.format(max_lines=BULK_ITEMS_MAX_LINES)
+            )
+        return lines
+
+    def save(self):
+        """Add every new line to the list.
+
+        Lines already in the list end up in ``skipped``, and further copies of a
+        line in the input in ``repeated``.
+        """
+        lines = list(dict.fromkeys(self.cleaned_data["items"]))
+        seen = set()
+        for line in self.cleaned_data["items"]:
+            if line in seen:
+                self.repeated.append(line)
+            seen.add(line)
         try:
-            self.instance.validate_unique()
-        except forms.ValidationError as e:
-            e.error_dict = {"text": [DUPLICATE_ITEM_ERROR]}
-            self._update_errors(e)
+            with transaction.atomic():
+                existing = self._existing_texts(lines)
+                self.skipped = [line for line in lines if line in existing]
+                new_items = [
+                    Item(list=self.list, text=line)
+                    for line in lines
+                    if line not in existing
+                ]
+                Item.objects.bulk_create(new_items)
+                if new_items:
+                    List.record_items_added(self.list.id, new_items[0].text)
+        except IntegrityError:
+            self.skipped = []
+            self.repeated = []
+            self.add_error("items", CONCURRENT_BULK_ITEMS_ERROR)
+            return None
+        return new_items
+
+    def _existing_texts(self, lines):
+        """Those of ``lines`` already in the list, looked up in batches."""
+        existing = set()
+        items = self.list.item_set.order_by()
+        for start in range(0, len(lines), BULK_ITEMS_LOOKUP_BATCH_SIZE):
+            end = start + BULK_ITEMS_LOOKUP_BATCH_SIZE
+            existing.update(
+                items.filter(text__in=lines[start:end]).values_list("text", flat=True)
+            )
+        return existing
+
+
+class MultiEmailField(forms.Field):
+    """Email addresses separated by commas, semicolons or whitespace."""
+
+    widget = forms.widgets.EmailInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        emails = [email for email in re.split(r"[\s,;]+", value) if email]
+        return list(dict.fromkeys(emails))
+
+    def validate(self, value):
+        super().validate(value)
+        for email in value:
+            validate_email(email)
+
+    def widget_attrs(self, widget):
+        attrs = super().widget_attrs(widget)
+        attrs["multiple"] = True
+        return attrs
 
 
 class ShareListForm(forms.models.ModelForm):
@@ -52,11 +175,14 @@ class ShareListForm(forms.models.ModelForm):
         model = List
         fields = ("shared_with",)
 
-    def __init__(self, for_list, *args, **kwargs):
+    def __init__(self, for_list, *args, identity_map=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.instance = for_list
+        self.identity_map = identity_map or IdentityMap()
+        self.sharees = []
+        self.unknown_emails = []
 
-    shared_with = forms.EmailField(
+    shared_with = MultiEmailField(
         widget=forms.widgets.EmailInput(
             attrs={
                 "placeholder": "your-friend@example.com",
@@ -65,17 +191,19 @@ class ShareListForm(forms.models.ModelForm):
     )
 
     def clean_shared_with(self):
-        email = self.cleaned_data["shared_with"]
-        if email:
-            try:
-                User.objects.get(pk=email)
-            except User.DoesNotExist:
-                raise forms.ValidationError("This user does not exist.")
-        return email
+        emails = self.cleaned_data["shared_with"]
+        if len(emails) > SHARE_MAX_EMAILS:
+            raise forms.ValidationError(
+                TOO_MANY_EMAILS_ERROR.format(max_emails=SHARE_MAX_EMAILS)
+            )
+        users = self.identity_map.get_many(User.objects.all(), emails)
+        if not users:
+            raise forms.ValidationError(USER_DOES_NOT_EXIST_ERROR)
+        self.sharees = [users[email] for email in emails if email in users]
+        self.unknown_emails = [email for email in emails if email not in users]
+        return emails
 
     def save(self):
-        shared_with = self.cleaned_data["shared_with"]
-        user = User.objects.get(pk=shared_with)
-        self.instance.shared_with.add(user)
+        self.instance.shared_with.add(*self.sharees)
 
         return self.instance
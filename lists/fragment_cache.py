@@ -0,0 +1,57 @@
+import hashlib
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def fragment_key(name, list_, vary_on=()):
+    """Cache key of a rendered fragment for the current version of ``list_``.
+
+    Any change to the list bumps its version, so stale fragments are never
+    read again and simply expire.
+    """
+    vary = hashlib.md5(":".join(str(value) for value in vary_on).encode())
+    return "list-fragment:{name}:{pk}:{version}:{stamp}:{vary}".format(
+        name=name,
+        pk=list_.pk,
+        version=list_.version,
+        stamp=list_.updated_at.timestamp(),
+        vary=vary.hexdigest(),
+    )
+
+
+def get_or_render(name, list_, vary_on, render):
+    key = fragment_key(name, list_, vary_on)
+    content = cache.get(key)
+    if content is not None:
+        _count(name, "hits")
+        return content
+    _count(name, "misses")
+    content = render()
+    cache.set(key, content, settings.LIST_FRAGMENT_CACHE_TIMEOUT)
+    return content
+
+
+def _count(name, outcome):
+    with _counts_lock:
+        _counts[name, outcome] += 1
+
+
+def stats():
+    """Hit and miss counts of this process, by fragment name."""
+    with _counts_lock:
+        counts = dict(_counts)
+    result = {}
+    for (name, outcome), count in counts.items():
+        result.setdefault(name, {"hits": 0, "misses": 0})[outcome] = count
+    return result
+
+
+def reset_stats():
+    with _counts_lock:
+        _counts.clear()
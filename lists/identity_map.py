@@ -0,0 +1,62 @@
+_MISSING = object()
+
+
+class IdentityMap(object):
+    """Model instances already loaded, so each row is fetched at most once.
+
+    Objects are remembered per queryset as well as per primary key: one
+    loaded through a queryset with other filters, ``select_related`` or
+    ``only`` is never handed out for a different queryset.
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    def _key(self, queryset, pk):
+        model = queryset.model
+        return model, str(queryset.query), model._meta.pk.to_python(pk)
+
+    def get(self, queryset, pk):
+        """Like ``queryset.get(pk=pk)``, but only queries on the first call."""
+        key = self._key(queryset, pk)
+        obj = self._objects.get(key)
+        if obj is None:
+            obj = queryset.filter(pk=pk).first() or _MISSING
+            self._objects[key] = obj
+        if obj is _MISSING:
+            raise queryset.model.DoesNotExist(
+                f"{queryset.model._meta.object_name} matching query does not exist."
+            )
+        return obj
+
+    def get_many(self, queryset, pks):
+        """Objects with the given primary keys, loading missing ones in one query.
+
+        Returns a dict by primary key, without the keys of objects that don't
+        exist.
+        """
+        keys = {pk: self._key(queryset, pk) for pk in pks}
+        unloaded = {key[2]: key for key in keys.values() if key not in self._objects}
+        if unloaded:
+            found = {obj.pk: obj for obj in queryset.filter(pk__in=list(unloaded))}
+            for pk, key in unloaded.items():
+                self._objects[key] = found.get(pk, _MISSING)
+        return {
+            pk: self._objects[key]
+            for pk, key in keys.items()
+            if self._objects[key] is not _MISSING
+        }
+
+    def add(self, obj, queryset=None):
+        """Remember ``obj`` as loaded by ``queryset``, or by its default manager."""
+        if queryset is None:
+            queryset = type(obj)._default_manager.all()
+        self._objects[self._key(queryset, obj.pk)] = obj
+        return obj
+
+
+def identity_map(request):
+    """The identity map shared by everything handling ``request``."""
+    if not hasattr(request, "_identity_map"):
+        request._identity_map = IdentityMap()
+    return request._identity_map
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_list_names(apps, schema_editor):
+    List = apps.get_model('lists', 'List')
+    Item = apps.get_model('lists', 'Item')
+    first_item_text = (
+        Item.objects.filter(list=models.OuterRef('pk'))
+        .order_by('id')
+        .values('text')[:1]
+    )
+    List.objects.update(
+        name=Coalesce(models.Subquery(first_item_text), models.Value(''))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0008_list_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_list_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 14:11
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0009_backfill_list_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='list',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='list',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
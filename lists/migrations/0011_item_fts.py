@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+# An external-content FTS5 index over lists_item.text, kept in sync by
+# triggers so that bulk inserts are indexed too. SQLite drops the triggers when
+# Django rebuilds lists_item for a schema change, so such a migration has to
+# recreate them.
+CREATE_ITEM_FTS = [
+    """
+    CREATE VIRTUAL TABLE lists_item_fts USING fts5(
+        text, content='lists_item', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_insert AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_delete AFTER DELETE ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_update AFTER UPDATE OF text ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    "INSERT INTO lists_item_fts(lists_item_fts) VALUES ('rebuild')",
+]
+
+DROP_ITEM_FTS = [
+    "DROP TRIGGER IF EXISTS lists_item_fts_insert",
+    "DROP TRIGGER IF EXISTS lists_item_fts_delete",
+    "DROP TRIGGER IF EXISTS lists_item_fts_update",
+    "DROP TABLE IF EXISTS lists_item_fts",
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0010_list_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_sqlite(CREATE_ITEM_FTS), run_on_sqlite(DROP_ITEM_FTS)
+        ),
+    ]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from importlib import import_module
+
+from django.db import migrations
+
+item_fts = import_module("lists.migrations.0011_item_fts")
+
+# Index each item's list id next to its text, so searches can restrict the
+# match to the user's lists inside the FTS query itself. The list id column
+# must not count towards the ranking.
+CREATE_ITEM_FTS = [
+    """
+    CREATE VIRTUAL TABLE lists_item_fts USING fts5(
+        text, list_id, content='lists_item', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    INSERT INTO lists_item_fts(lists_item_fts, rank)
+    VALUES ('rank', 'bm25(1.0, 0.0)')
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_insert AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text, list_id)
+        VALUES (new.id, new.text, new.list_id);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_delete AFTER DELETE ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text, list_id)
+        VALUES ('delete', old.id, old.text, old.list_id);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_update AFTER UPDATE OF text, list_id ON lists_item
+    BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text, list_id)
+        VALUES ('delete', old.id, old.text, old.list_id);
+        INSERT INTO lists_item_fts(rowid, text, list_id)
+        VALUES (new.id, new.text, new.list_id);
+    END
+    """,
+    "INSERT INTO lists_item_fts(lists_item_fts) VALUES ('rebuild')",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0011_item_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            item_fts.run_on_sqlite(item_fts.DROP_ITEM_FTS + CREATE_ITEM_FTS),
+            item_fts.run_on_sqlite(item_fts.DROP_ITEM_FTS + item_fts.CREATE_ITEM_FTS),
+        ),
+    ]
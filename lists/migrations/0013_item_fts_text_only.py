@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from importlib import import_module
+
+from django.db import migrations
+
+item_fts = import_module("lists.migrations.0011_item_fts")
+item_fts_list_id = import_module("lists.migrations.0012_item_fts_list_id")
+
+# Searches now restrict matches to the user's items by rowid, so the index
+# goes back to holding only the text.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0012_item_fts_list_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            item_fts.run_on_sqlite(item_fts.DROP_ITEM_FTS + item_fts.CREATE_ITEM_FTS),
+            item_fts.run_on_sqlite(
+                item_fts.DROP_ITEM_FTS + item_fts_list_id.CREATE_ITEM_FTS
+            ),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 
 
 class List(models.Model):
@@ -8,19 +12,76 @@ class List(models.Model):
     shared_with = models.ManyToManyField(
         settings.AUTH_USER_MODEL, blank=True, related_name="shared_lists"
     )
+    # Text of the first item, denormalized so listing pages don't need a
+    # query per list. Kept in sync when items are saved or deleted, below.
+    name = models.TextField(default="", blank=True)
+    # Bumped whenever the items or sharees change, for conditional GETs.
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def get_absolute_url(self):
         return reverse("view_list", args=[self.id])
 
     @staticmethod
     def create_new(first_item_text, owner=None):
-        list_ = List.objects.create(owner=owner)
+        list_ = List.objects.create(owner=owner, name=first_item_text)
         Item.objects.create(text=first_item_text, list=list_)
         return list_
 
-    @property
-    def name(self):
-        return self.item_set.first().text
+    @staticmethod
+    def touch(list_id, **changes):
+        return List.touch_all(List.objects.filter(pk=list_id), **changes)
+
+    @staticmethod
+    def touch_all(lists, **changes):
+        return lists.update(
+            version=models.F("version") + 1, updated_at=timezone.now(), **changes
+        )
+
+    @staticmethod
+    def record_items_added(list_id, first_item_text):
+        """Bump the list's version, naming it after the first item if unnamed."""
+        return List.touch(
+            list_id,
+            name=models.Case(
+                models.When(name="", then=models.Value(first_item_text)),
+                default=models.F("name"),
+            ),
+        )
+
+    @staticmethod
+    def refresh_name(list_id):
+        List.refresh_names(List.objects.filter(pk=list_id))
+
+    @staticmethod
+    def refresh_names(lists):
+        """Rename each of ``lists`` after its first item, in one query."""
+        first_item_text = (
+            Item.objects.filter(list=models.OuterRef("pk"))
+            .order_by("id")
+            .values("text")[:1]
+        )
+        List.touch_all(
+            lists,
+            name=Coalesce(models.Subquery(first_item_text), models.Value("")),
+        )
+
+
+class ItemQuerySet(models.QuerySet):
+    # Lists are renamed here and in Item.delete rather than by a post_delete
+    # receiver, which would stop Django from deleting a deleted list's items
+    # in one query and refresh the list's name once per item.
+
+    def delete(self):
+        """Delete the items, then rename each list they were in once."""
+        list_ids = set(self.order_by().values_list("list_id", flat=True))
+        deleted = super().delete()
+        if list_ids:
+            List.refresh_names(List.objects.filter(pk__in=list_ids))
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
 class Item(models.Model):
@@ -31,8 +92,41 @@ class Item(models.Model):
     text = models.TextField(default="")
     list = models.ForeignKey(List, default=None)
 
+    objects = ItemQuerySet.as_manager()
+
     def __str__(self):
         return self.text
 
     def get_absolute_url(self):
-        return reverse("view_list", args=[self.list.id])
+        return reverse("view_list", args=[self.list_id])
+
+    def delete(self, *args, **kwargs):
+        deleted = super().delete(*args, **kwargs)
+        List.refresh_name(self.list_id)
+        return deleted
+
+
+@receiver(post_save, sender=Item)
+def update_list_on_item_save(sender, instance, created, **kwargs):
+    if not created:
+        List.refresh_name(instance.list_id)
+        return
+    # Items are ordered by id, so a new item is only the first one when the
+    # list has no name yet.
+    List.record_items_added(instance.list_id, instance.text)
+    if Item.list.is_cached(instance) and not instance.list.name:
+        instance.list.name = instance.text
+
+
+@receiver(m2m_changed, sender=List.shared_with.through)
+def update_list_on_share(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # Sharing with an existing sharee still sends post_add, with nothing in
+    # pk_set
+    if action != "post_clear" and not pk_set:
+        return
+    if not reverse:
+        List.touch(instance.pk)
+    elif pk_set:
+        List.touch_all(List.objects.filter(pk__in=pk_set))
@@ -0,0 +1,89 @@
+from django.utils.functional import cached_property
+
+
+def parse_cursor(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_numbered_cursor(value):
+    """``(after, offset)`` from an ``"<id>:<offset>"`` cursor, or ``(None, 0)``."""
+    after, _, offset = (value or "").partition(":")
+    after, offset = parse_cursor(after), parse_cursor(offset)
+    if after is None or offset is None or offset < 0:
+        return None, 0
+    return after, offset
+
+
+class KeysetPage(object):
+    """A window of at most ``size`` rows of ``queryset`` with ids above ``after``.
+
+    Rows are fetched lazily, on first access, with a single query that reads one
+    extra row to find out whether there is a next page. ``offset`` is the number
+    of rows before the page, carried in the cursor rather than counted, so later
+    pages cost no more than the first.
+    """
+
+    def __init__(self, queryset, after=None, size=50, offset=0):
+        self.queryset = queryset
+        self.after = after
+        self.size = size
+        self.offset = offset
+
+    @cached_property
+    def _rows(self):
+        queryset = self.queryset.order_by("id")
+        if self.after is not None:
+            queryset = queryset.filter(id__gt=self.after)
+        return list(queryset[: self.size + 1])
+
+    @property
+    def object_list(self):
+        return self._rows[: self.size]
+
+    @property
+    def has_next(self):
+        return len(self._rows) > self.size
+
+    @property
+    def next_cursor(self):
+        if self.has_next:
+            return self.object_list[-1].id
+        return None
+
+    @property
+    def next_numbered_cursor(self):
+        """Cursor of the next page that also carries the numbering, for rows."""
+        if self.has_next:
+            return f"{self.next_cursor}:{self.offset + self.size}"
+        return None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def iter_keyset_chunks(queryset, after=None, chunk_size=1000):
+    """Yield ``queryset`` rows in id order, fetching ``chunk_size`` rows per query.
+
+    ``queryset`` must be a ``values_list`` with the id as its first column. Each
+    chunk is a separate short query, so a slow consumer never keeps a read
+    transaction open for the whole result.
+    """
+    queryset = queryset.order_by("id")
+    while True:
+        chunk = queryset if after is None else queryset.filter(id__gt=after)
+        fetched = 0
+        for row in chunk[:chunk_size].iterator():
+            fetched += 1
+            yield row
+        if fetched < chunk_size:
+            return
+        after = row[0]
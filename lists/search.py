@@ -0,0 +1,75 @@
+import re
+
+from lists.models import Item
+
+# Matches are checked against the ids of the user's items, looked up by list,
+# so other users' matches are skipped without reading their rows. The unary +
+# keeps SQLite from running the FTS query once per item instead. Every match
+# of the words is still read, as FTS5's bm25() does to rank them anyway.
+SEARCH_SQL = """
+    WITH user_lists(id) AS (
+        SELECT id FROM lists_list WHERE owner_id = %s
+        UNION
+        SELECT list_id FROM lists_list_shared_with WHERE user_id = %s
+    ),
+    user_items(id) AS (
+        SELECT id FROM lists_item WHERE list_id IN user_lists
+    )
+    SELECT lists_item.id, lists_item.text, lists_item.list_id,
+           lists_list.name AS list_name, lists_item_fts.rank AS rank
+    FROM lists_item_fts
+    JOIN lists_item ON lists_item.id = lists_item_fts.rowid
+    JOIN lists_list ON lists_list.id = lists_item.list_id
+    WHERE lists_item_fts MATCH %s
+      AND +lists_item_fts.rowid IN user_items
+      {after}
+    ORDER BY lists_item_fts.rank, lists_item.id
+    LIMIT %s
+"""
+SEARCH_AFTER_SQL = "AND (lists_item_fts.rank, lists_item.id) > (%s, %s)"
+
+
+def fts_query(text):
+    """An FTS5 query matching items containing every word of ``text``.
+
+    Words are quoted, so user input can't use FTS5 query syntax, and the last
+    one matches as a prefix, for search-as-you-type.
+    """
+    words = ['"%s"' % word for word in re.findall(r"\w+", text)]
+    if not words:
+        return ""
+    words[-1] += "*"
+    return " ".join(words)
+
+
+def search_cursor(item):
+    """Cursor of the results ranked after ``item``."""
+    return f"{item.rank!r}:{item.id}"
+
+
+def parse_search_cursor(value):
+    """``(rank, id)`` from a cursor made by ``search_cursor``, or None."""
+    rank, _, id_ = (value or "").partition(":")
+    try:
+        return float(rank), int(id_)
+    except ValueError:
+        return None
+
+
+def search_items(user, text, after=None, limit=20):
+    """Best-ranked items matching ``text`` in lists ``user`` owns or shares.
+
+    Results are paginated by ``after``, the ``(rank, id)`` of the last item of
+    the previous page. The items are annotated with the ``list_name`` of their
+    list and their ``rank``.
+    """
+    query = fts_query(text)
+    if not query or not user.is_authenticated:
+        return []
+    params = [user.pk, user.pk, query]
+    if after is None:
+        sql = SEARCH_SQL.format(after="")
+    else:
+        sql = SEARCH_SQL.format(after=SEARCH_AFTER_SQL)
+        params += after
+    return list(Item.objects.raw(sql, params + [limit]))
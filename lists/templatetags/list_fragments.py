@@ -0,0 +1,40 @@
+from django import template
+
+from lists import fragment_cache
+
+register = template.Library()
+
+
+class ListFragmentNode(template.Node):
+    def __init__(self, nodelist, name, list_, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.list = list_
+        self.vary_on = vary_on
+
+    def render(self, context):
+        return fragment_cache.get_or_render(
+            self.name.resolve(context),
+            self.list.resolve(context),
+            [var.resolve(context) for var in self.vary_on],
+            lambda: self.nodelist.render(context),
+        )
+
+
+@register.tag
+def list_fragment(parser, token):
+    """Cache the enclosed template for the current version of a list.
+
+    Usage::
+
+        {% list_fragment "name" list [vary_on ...] %} ... {% endlist_fragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a fragment name and a list."
+        )
+    nodelist = parser.parse(("endlist_fragment",))
+    parser.delete_first_token()
+    name, list_, *vary_on = [parser.compile_filter(bit) for bit in bits[1:]]
+    return ListFragmentNode(nodelist, name, list_, vary_on)
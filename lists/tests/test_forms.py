@@ -2,10 +2,13 @@ import unittest
 from unittest.mock import Mock, patch
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from lists.forms import (DUPLICATE_ITEM_ERROR, EMPTY_ITEM_ERROR, ExistingListItemForm,
-                         ItemForm, NewListForm, ShareListForm)
+from lists.forms import (BULK_ITEMS_MAX_LINES, DUPLICATE_ITEM_ERROR,
+                         EMPTY_BULK_ITEMS_ERROR, EMPTY_ITEM_ERROR, BulkItemsForm,
+                         ExistingListItemForm, ItemForm, NewListForm, ShareListForm)
 from lists.models import Item, List
 
 User = get_user_model()
@@ -35,12 +38,14 @@ class ExistingListItemFormTest(TestCase):
         self.assertFalse(form.is_valid())
         self.assertEqual(form.errors["text"], [EMPTY_ITEM_ERROR])
 
-    def test_form_validation_for_duplicate_items(self):
+    def test_save_reports_duplicate_items(self):
         list_ = List.objects.create()
         Item.objects.create(list=list_, text="no twins!")
         form = ExistingListItemForm(for_list=list_, data={"text": "no twins!"})
-        self.assertFalse(form.is_valid())
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(form.save())
         self.assertEqual(form.errors["text"], [DUPLICATE_ITEM_ERROR])
+        self.assertEqual(list_.item_set.count(), 1)
 
     def test_form_save(self):
         list_ = List.objects.create()
@@ -48,6 +53,114 @@ class ExistingListItemFormTest(TestCase):
         new_item = form.save()
         self.assertEqual(new_item, Item.objects.all()[0])
 
+    def test_validation_does_not_touch_the_database(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(for_list=list_, data={"text": "hi"})
+        with self.assertNumQueries(0):
+            self.assertTrue(form.is_valid())
+
+    def test_save_inserts_without_checking_for_duplicates_first(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(for_list=list_, data={"text": "hi"})
+        form.is_valid()
+        with CaptureQueriesContext(connection) as queries:
+            form.save()
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertNotIn("SELECT", statements)
+        self.assertEqual(statements.count("INSERT"), 1)
+
+    def test_save_without_commit_does_not_insert(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(for_list=list_, data={"text": "hi"})
+        with self.assertNumQueries(0):
+            item = form.save(commit=False)
+        self.assertIsNone(item.pk)
+        self.assertEqual(item.list, list_)
+
+    def test_save_refuses_invalid_form(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(for_list=list_, data={"text": ""})
+        with self.assertRaises(ValueError):
+            form.save()
+
+
+class BulkItemsFormTest(TestCase):
+    def test_form_renders_textarea(self):
+        form = BulkItemsForm(for_list=List.objects.create())
+        self.assertIn("<textarea", form.as_p())
+        self.assertIn('placeholder="Paste to-do items, one per line"', form.as_p())
+
+    def test_form_validation_for_blank_input(self):
+        form = BulkItemsForm(for_list=List.objects.create(), data={"items": "\n  \n"})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["items"], [EMPTY_BULK_ITEMS_ERROR])
+
+    def test_form_validation_for_too_many_lines(self):
+        data = {"items": "\n".join(str(i) for i in range(BULK_ITEMS_MAX_LINES + 1))}
+        form = BulkItemsForm(for_list=List.objects.create(), data=data)
+        self.assertFalse(form.is_valid())
+
+    def test_save_adds_new_lines_in_order(self):
+        list_ = List.objects.create()
+        form = BulkItemsForm(for_list=list_, data={"items": "one\n  two  \n\nthree"})
+        form.is_valid()
+        form.save()
+        self.assertEqual(
+            [item.text for item in list_.item_set.all()], ["one", "two", "three"]
+        )
+
+    def test_save_skips_duplicates_in_list_and_input(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text="old")
+        form = BulkItemsForm(for_list=list_, data={"items": "old\nnew\nnew"})
+        form.is_valid()
+        added = form.save()
+        self.assertEqual([item.text for item in added], ["new"])
+        self.assertEqual(form.skipped, ["old"])
+        self.assertEqual(form.repeated, ["new"])
+        self.assertEqual(list_.item_set.count(), 2)
+
+    def test_save_only_looks_up_submitted_texts(self):
+        list_ = List.objects.create()
+        Item.objects.bulk_create(Item(list=list_, text=f"old {i}") for i in range(5))
+        form = BulkItemsForm(for_list=list_, data={"items": "old 3\nnew"})
+        form.is_valid()
+        with CaptureQueriesContext(connection) as queries:
+            form.save()
+        lookup = next(q["sql"] for q in queries if q["sql"].startswith("SELECT"))
+        self.assertIn("'old 3'", lookup)
+        self.assertNotIn("'old 0'", lookup)
+        self.assertEqual(form.skipped, ["old 3"])
+
+    @patch("lists.forms.BULK_ITEMS_LOOKUP_BATCH_SIZE", 2)
+    def test_save_looks_up_texts_in_batches(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text="e")
+        form = BulkItemsForm(for_list=list_, data={"items": "a\nb\nc\nd\ne"})
+        form.is_valid()
+        # savepoint, three lookups, insert, name update, release savepoint
+        with self.assertNumQueries(7):
+            added = form.save()
+        self.assertEqual([item.text for item in added], ["a", "b", "c", "d"])
+        self.assertEqual(form.skipped, ["e"])
+
+    def test_save_uses_a_fixed_number_of_queries(self):
+        list_ = List.objects.create()
+        data = {"items": "\n".join(f"item {i}" for i in range(100))}
+        form = BulkItemsForm(for_list=list_, data=data)
+        form.is_valid()
+        # savepoint, existing texts, insert, name update, release savepoint
+        with self.assertNumQueries(5):
+            form.save()
+        self.assertEqual(list_.item_set.count(), 100)
+
+    def test_save_names_unnamed_list(self):
+        list_ = List.objects.create()
+        form = BulkItemsForm(for_list=list_, data={"items": "first\nsecond"})
+        form.is_valid()
+        form.save()
+        self.assertEqual(List.objects.get(pk=list_.pk).name, "first")
+
 
 class NewListFormTest(unittest.TestCase):
     @patch("lists.forms.List.create_new")
@@ -107,3 +220,50 @@ class ShareListFormTest(unittest.TestCase):
         form = ShareListForm(for_list=list_, data={"shared_with": "asdf3@asdf.com"})
         self.assertFalse(form.is_valid())
         self.assertEqual(list_.shared_with.count(), 0)
+
+
+class ShareListFormBatchTest(TestCase):
+    def test_form_accepts_multiple_emails(self):
+        form = ShareListForm(for_list=List.objects.create())
+        self.assertIn("multiple", form.as_p())
+
+    def test_form_save_shares_with_every_email(self):
+        list_ = List.objects.create()
+        users = [User.objects.create(pk=f"user{i}@example.com") for i in range(3)]
+        emails = "user0@example.com, user1@example.com\nuser2@example.com"
+        form = ShareListForm(for_list=list_, data={"shared_with": emails})
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual(set(list_.shared_with.all()), set(users))
+
+    def test_form_checks_all_emails_with_one_query(self):
+        list_ = List.objects.create()
+        emails = [f"user{i}@example.com" for i in range(50)]
+        for email in emails:
+            User.objects.create(pk=email)
+        form = ShareListForm(for_list=list_, data={"shared_with": ",".join(emails)})
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        # existing shares, bulk insert, version update
+        with self.assertNumQueries(3):
+            form.save()
+        self.assertEqual(list_.shared_with.count(), 50)
+
+    def test_form_reports_unknown_emails(self):
+        list_ = List.objects.create()
+        user = User.objects.create(pk="bob@example.com")
+        form = ShareListForm(
+            for_list=list_, data={"shared_with": "nobody@example.com bob@example.com"}
+        )
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual(form.unknown_emails, ["nobody@example.com"])
+        self.assertEqual(list(list_.shared_with.all()), [user])
+
+    def test_form_validation_for_invalid_email_in_batch(self):
+        User.objects.create(pk="bob@example.com")
+        form = ShareListForm(
+            for_list=List.objects.create(),
+            data={"shared_with": "bob@example.com, not-an-email"},
+        )
+        self.assertFalse(form.is_valid())
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import TestCase
+
+from lists import fragment_cache
+from lists.models import Item, List
+
+User = get_user_model()
+
+
+class FragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        fragment_cache.reset_stats()
+        self.list_ = List.create_new(first_item_text="item")
+
+    def render(self, list_, vary_on=""):
+        template = Template(
+            "{% load list_fragments %}"
+            '{% list_fragment "test" list vary_on %}{{ render_count }}'
+            "{% endlist_fragment %}"
+        )
+        self.renders = getattr(self, "renders", 0) + 1
+        return template.render(
+            Context({"list": list_, "vary_on": vary_on, "render_count": self.renders})
+        )
+
+    def test_second_render_is_a_hit(self):
+        self.assertEqual(self.render(self.list_), "1")
+        self.assertEqual(self.render(self.list_), "1")
+        self.assertEqual(fragment_cache.stats(), {"test": {"hits": 1, "misses": 1}})
+
+    def test_new_list_version_is_a_miss(self):
+        self.render(self.list_)
+        Item.objects.create(list=self.list_, text="another item")
+        self.assertEqual(self.render(List.objects.get(pk=self.list_.pk)), "2")
+
+    def test_vary_on_values_are_part_of_the_key(self):
+        self.render(self.list_, vary_on="a")
+        self.assertEqual(self.render(self.list_, vary_on="b"), "2")
+
+    def test_tag_requires_name_and_list(self):
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                '{% load list_fragments %}{% list_fragment "x" %}{% endlist_fragment %}'
+            )
+
+
+class ListPageFragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        fragment_cache.reset_stats()
+        self.list_ = List.create_new(first_item_text="item")
+        self.list_.shared_with.add(User.objects.create(email="a@b.com"))
+        self.url = f"/lists/{self.list_.id}/"
+
+    def test_repeated_views_reuse_table_and_sharees(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertContains(response, "1: item")
+        self.assertContains(response, "a@b.com")
+        self.assertEqual(
+            fragment_cache.stats(),
+            {
+                "table": {"hits": 1, "misses": 1},
+                "share_list": {"hits": 1, "misses": 1},
+            },
+        )
+
+    def test_new_items_and_sharees_are_shown(self):
+        self.client.get(self.url)
+        self.client.post(self.url, data={"text": "new item"})
+        self.list_.shared_with.add(User.objects.create(email="c@d.com"))
+        response = self.client.get(self.url)
+        self.assertContains(response, "2: new item")
+        self.assertContains(response, "c@d.com")
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+
+from lists.identity_map import IdentityMap, identity_map
+from lists.models import List
+
+User = get_user_model()
+
+
+class IdentityMapTest(TestCase):
+    def test_loads_each_object_once(self):
+        list_ = List.objects.create()
+        objects = IdentityMap()
+        with self.assertNumQueries(1):
+            first = objects.get(List.objects.all(), list_.pk)
+            second = objects.get(List.objects.all(), str(list_.pk))
+        self.assertIs(first, second)
+        self.assertEqual(first, list_)
+
+    def test_remembers_missing_objects(self):
+        objects = IdentityMap()
+        with self.assertNumQueries(1):
+            for _ in range(2):
+                with self.assertRaises(List.DoesNotExist):
+                    objects.get(List.objects.all(), 123)
+
+    def test_get_many_loads_unknown_objects_in_one_query(self):
+        lists = [List.objects.create() for _ in range(3)]
+        objects = IdentityMap()
+        objects.get(List.objects.all(), lists[0].pk)
+        with self.assertNumQueries(1):
+            found = objects.get_many(
+                List.objects.all(), [list_.pk for list_ in lists] + [999]
+            )
+        self.assertEqual(found, {list_.pk: list_ for list_ in lists})
+        with self.assertNumQueries(0):
+            objects.get_many(List.objects.all(), [lists[1].pk, 999])
+
+    def test_added_objects_are_not_loaded(self):
+        list_ = List.objects.create()
+        objects = IdentityMap()
+        objects.add(list_)
+        with self.assertNumQueries(0):
+            self.assertIs(objects.get(List.objects.all(), list_.pk), list_)
+
+    def test_filtered_lookup_does_not_reuse_unfiltered_object(self):
+        owner = User.objects.create(email="a@b.com")
+        list_ = List.objects.create()
+        objects = IdentityMap()
+        objects.get(List.objects.all(), list_.pk)
+        with self.assertNumQueries(1):
+            with self.assertRaises(List.DoesNotExist):
+                objects.get(List.objects.filter(owner=owner), list_.pk)
+
+    def test_select_related_lookup_is_loaded_separately(self):
+        list_ = List.objects.create(owner=User.objects.create(email="a@b.com"))
+        objects = IdentityMap()
+        objects.get(List.objects.all(), list_.pk)
+        with self.assertNumQueries(1):
+            related = objects.get(List.objects.select_related("owner"), list_.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(related.owner.email, "a@b.com")
+
+    def test_one_map_per_request(self):
+        request = RequestFactory().get("/")
+        self.assertIs(identity_map(request), identity_map(request))
+        self.assertIsNot(identity_map(request), identity_map(RequestFactory().get("/")))
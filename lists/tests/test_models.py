@@ -87,6 +87,89 @@ class ListModelTest(TestCase):
         Item.objects.create(list=list_, text="second item")
         self.assertEqual(list_.name, "first item")
 
+    def test_create_new_stores_list_name(self):
+        List.create_new(first_item_text="new item text")
+        self.assertEqual(List.objects.get().name, "new item text")
+
+    def test_list_name_is_stored_when_first_item_added(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text="first item")
+        Item.objects.create(list=list_, text="second item")
+        self.assertEqual(List.objects.get(pk=list_.pk).name, "first item")
+
+    def test_list_name_follows_edits_to_first_item(self):
+        list_ = List.create_new(first_item_text="first item")
+        item = list_.item_set.first()
+        item.text = "edited item"
+        item.save()
+        self.assertEqual(List.objects.get(pk=list_.pk).name, "edited item")
+
+    def test_list_name_falls_back_to_next_item_on_delete(self):
+        list_ = List.create_new(first_item_text="first item")
+        Item.objects.create(list=list_, text="second item")
+        list_.item_set.first().delete()
+        self.assertEqual(List.objects.get(pk=list_.pk).name, "second item")
+
+    def test_list_name_is_empty_when_all_items_deleted(self):
+        list_ = List.create_new(first_item_text="first item")
+        Item.objects.filter(list=list_).delete()
+        self.assertEqual(List.objects.get(pk=list_.pk).name, "")
+
+    def test_deleting_items_renames_each_list_once(self):
+        first = List.create_new(first_item_text="a1")
+        Item.objects.bulk_create(Item(list=first, text=f"a{n}") for n in range(2, 5))
+        second = List.create_new(first_item_text="b1")
+        Item.objects.create(list=second, text="b2")
+        # Select the ids, delete, then one rename
+        with self.assertNumQueries(3):
+            Item.objects.filter(text__in=["a1", "a2", "b1"]).delete()
+        self.assertEqual(List.objects.get(pk=first.pk).name, "a3")
+        self.assertEqual(List.objects.get(pk=second.pk).name, "b2")
+
+    def test_deleting_a_list_deletes_its_items_without_renaming(self):
+        list_ = List.create_new(first_item_text="item 0")
+        Item.objects.bulk_create(
+            Item(list=list_, text=f"item {n}") for n in range(1, 201)
+        )
+        # The sharees, the items and the list, whatever the number of items
+        with self.assertNumQueries(3):
+            list_.delete()
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_reading_list_name_does_not_query(self):
+        List.create_new(first_item_text="first item")
+        list_ = List.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(list_.name, "first item")
+
+    def test_adding_item_bumps_version(self):
+        list_ = List.objects.create()
+        before = List.objects.get(pk=list_.pk)
+        Item.objects.create(list=list_, text="item")
+        after = List.objects.get(pk=list_.pk)
+        self.assertEqual(after.version, before.version + 1)
+        self.assertGreater(after.updated_at, before.updated_at)
+
+    def test_sharing_bumps_version(self):
+        list_ = List.objects.create()
+        user = User.objects.create(email="abc@example.com")
+        list_.shared_with.add(user)
+        self.assertEqual(List.objects.get(pk=list_.pk).version, 1)
+
+    def test_sharing_from_user_side_bumps_version(self):
+        list_ = List.objects.create()
+        user = User.objects.create(email="abc@example.com")
+        user.shared_lists.add(list_)
+        self.assertEqual(List.objects.get(pk=list_.pk).version, 1)
+
+    def test_sharing_again_does_not_bump_version(self):
+        list_ = List.objects.create()
+        user = User.objects.create(email="abc@example.com")
+        list_.shared_with.add(user)
+        list_.shared_with.add(user)
+        user.shared_lists.add(list_)
+        self.assertEqual(List.objects.get(pk=list_.pk).version, 1)
+
     def test_can_add_users_with_shared_with(self):
         list_: List = List.objects.create()
         user = User.objects.create(email="abc@example.com")
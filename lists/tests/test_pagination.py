@@ -0,0 +1,76 @@
+from django.test import TestCase
+
+from lists.models import List
+from lists.pagination import (KeysetPage, iter_keyset_chunks, parse_cursor,
+                              parse_numbered_cursor)
+
+
+class ParseCursorTest(TestCase):
+    def test_parses_integer_ids(self):
+        self.assertEqual(parse_cursor("42"), 42)
+
+    def test_returns_none_for_missing_or_invalid_values(self):
+        self.assertIsNone(parse_cursor(None))
+        self.assertIsNone(parse_cursor("abc"))
+
+
+class ParseNumberedCursorTest(TestCase):
+    def test_parses_id_and_offset(self):
+        self.assertEqual(parse_numbered_cursor("42:500"), (42, 500))
+
+    def test_returns_first_page_for_missing_or_invalid_values(self):
+        for value in (None, "", "42", "42:", "abc:1", "42:-1"):
+            self.assertEqual(parse_numbered_cursor(value), (None, 0))
+
+
+class KeysetPageTest(TestCase):
+    def setUp(self):
+        self.lists = [List.objects.create() for _ in range(5)]
+
+    def test_does_not_query_until_accessed(self):
+        with self.assertNumQueries(0):
+            KeysetPage(List.objects.all(), size=2)
+
+    def test_first_page(self):
+        page = KeysetPage(List.objects.all(), size=2)
+        with self.assertNumQueries(1):
+            self.assertEqual(list(page), self.lists[:2])
+            self.assertTrue(page.has_next)
+            self.assertEqual(page.next_cursor, self.lists[1].id)
+
+    def test_page_after_cursor(self):
+        page = KeysetPage(List.objects.all(), after=self.lists[1].id, size=2)
+        self.assertEqual(list(page), self.lists[2:4])
+
+    def test_last_page_has_no_next_cursor(self):
+        page = KeysetPage(List.objects.all(), after=self.lists[2].id, size=2)
+        self.assertEqual(list(page), self.lists[3:])
+        self.assertFalse(page.has_next)
+        self.assertIsNone(page.next_cursor)
+        self.assertIsNone(page.next_numbered_cursor)
+
+    def test_numbered_cursor_carries_offset_without_counting(self):
+        page = KeysetPage(List.objects.all(), after=self.lists[1].id, size=2, offset=2)
+        with self.assertNumQueries(1):
+            self.assertEqual(page.offset, 2)
+            self.assertEqual(page.next_numbered_cursor, f"{self.lists[3].id}:4")
+
+
+class IterKeysetChunksTest(TestCase):
+    def setUp(self):
+        self.lists = [List.objects.create() for _ in range(5)]
+        self.ids = [list_.id for list_ in self.lists]
+
+    def test_yields_all_rows_in_id_order(self):
+        rows = iter_keyset_chunks(List.objects.values_list("id"), chunk_size=2)
+        self.assertEqual([row[0] for row in rows], self.ids)
+
+    def test_uses_one_query_per_chunk(self):
+        with self.assertNumQueries(3):
+            list(iter_keyset_chunks(List.objects.values_list("id"), chunk_size=2))
+
+    def test_starts_after_cursor(self):
+        rows = iter_keyset_chunks(
+            List.objects.values_list("id"), after=self.ids[2], chunk_size=2
+        )
+        self.assertEqual([row[0] for row in rows], self.ids[3:])
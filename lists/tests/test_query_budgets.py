@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from lists import urls
+from lists.models import Item, List
+from superlists.query_budgets import GROWTH_SIZES, QueryBudgetMixin
+
+User = get_user_model()
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(email="owner@example.com")
+        self.client.force_login(self.owner)
+        self.list_ = List.create_new(first_item_text="item 0", owner=self.owner)
+        self.url = self.list_.get_absolute_url()
+
+    def grow_items(self, size):
+        Item.objects.bulk_create(
+            Item(list=self.list_, text=f"item {n}")
+            for n in range(self.list_.item_set.count(), size)
+        )
+
+    def grow_sharees(self, size):
+        for n in range(self.list_.shared_with.count(), size):
+            self.list_.shared_with.add(User.objects.create(email=f"{n}@example.com"))
+
+    def grow_lists(self, size):
+        for n in range(self.owner.list_set.count(), size):
+            List.create_new(first_item_text=f"item {n}", owner=self.owner)
+            other = User.objects.create(email=f"other{n}@example.com")
+            List.create_new(first_item_text="shared", owner=other).shared_with.add(
+                self.owner
+            )
+
+    def test_every_url_has_a_budget(self):
+        for pattern in urls.urlpatterns:
+            self.assertIn(pattern.name, urls.QUERY_BUDGETS)
+
+    def test_home_page(self):
+        self.assertWithinQueryBudget("get", "/")
+
+    def test_new_list(self):
+        for size in GROWTH_SIZES:
+            with self.subTest(lists=size):
+                self.grow_lists(size)
+                self.assertWithinQueryBudget(
+                    "post", "/lists/new", data={"text": f"new list {size}"}
+                )
+
+    def test_view_list(self):
+        for size in GROWTH_SIZES:
+            with self.subTest(items=size, sharees=size):
+                self.grow_items(size)
+                self.grow_sharees(size)
+                self.assertWithinQueryBudget("get", self.url)
+
+    def test_add_item(self):
+        for size in GROWTH_SIZES:
+            with self.subTest(items=size, sharees=size):
+                self.grow_items(size)
+                self.grow_sharees(size)
+                self.assertWithinQueryBudget(
+                    "post", self.url, data={"text": f"new item {size}"}
+                )
+
+    def test_my_lists(self):
+        for size in GROWTH_SIZES:
+            with self.subTest(lists=size):
+                self.grow_lists(size)
+                self.assertWithinQueryBudget("get", f"/lists/users/{self.owner.email}/")
+
+    def test_share_list(self):
+        for size in GROWTH_SIZES:
+            with self.subTest(sharees=size):
+                self.grow_sharees(size)
+                emails = [f"new{size}-{n}@example.com" for n in range(size)]
+                for email in emails:
+                    User.objects.create(email=email)
+                self.assertWithinQueryBudget(
+                    "post", f"{self.url}share", data={"shared_with": ",".join(emails)}
+                )
+
+    def test_bulk_add_items(self):
+        for size in GROWTH_SIZES:
+            with self.subTest(items=size):
+                self.grow_items(size)
+                lines = "\n".join(f"bulk {size}-{n}" for n in range(size))
+                self.assertWithinQueryBudget(
+                    "post", f"{self.url}bulk", data={"items": lines}
+                )
+
+    def test_search(self):
+        for size in GROWTH_SIZES:
+            with self.subTest(lists=size, items=size):
+                self.grow_lists(size)
+                self.grow_items(size)
+                self.assertWithinQueryBudget("get", "/lists/search?q=item")
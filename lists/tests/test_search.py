@@ -0,0 +1,157 @@
+from unittest.mock import Mock
+from urllib.parse import quote
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from lists.forms import BulkItemsForm
+from lists.models import Item, List
+from lists.search import fts_query, parse_search_cursor, search_cursor, search_items
+from lists.views import SEARCH_PAGE_SIZE
+
+User = get_user_model()
+
+
+class FtsQueryTest(TestCase):
+    def test_quotes_words_and_matches_last_as_prefix(self):
+        self.assertEqual(fts_query("buy pea"), '"buy" "pea"*')
+
+    def test_strips_fts_syntax(self):
+        self.assertEqual(fts_query('milk" OR NEAR(*'), '"milk" "OR" "NEAR"*')
+
+    def test_empty_for_no_words(self):
+        self.assertEqual(fts_query(' "* '), "")
+
+
+class SearchItemsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="edith@example.com")
+        self.other = User.objects.create(email="francis@example.com")
+
+    def test_finds_items_in_owned_and_shared_lists(self):
+        owned = List.create_new(first_item_text="buy milk", owner=self.user)
+        shared = List.create_new(first_item_text="milk the cow", owner=self.other)
+        shared.shared_with.add(self.user)
+        List.create_new(first_item_text="spilt milk", owner=self.other)
+        List.create_new(first_item_text="milkshake")
+
+        results = search_items(self.user, "milk")
+
+        self.assertEqual(
+            sorted((item.text, item.list_name, item.list_id) for item in results),
+            [
+                ("buy milk", "buy milk", owned.id),
+                ("milk the cow", "milk the cow", shared.id),
+            ],
+        )
+
+    def test_matches_every_word_and_prefix_of_last(self):
+        list_ = List.create_new(first_item_text="buy peacock feathers", owner=self.user)
+        Item.objects.create(list=list_, text="buy milk")
+        results = search_items(self.user, "buy pea")
+        self.assertEqual([item.text for item in results], ["buy peacock feathers"])
+
+    def test_index_follows_edits_deletes_and_bulk_inserts(self):
+        list_ = List.create_new(first_item_text="buy milk", owner=self.user)
+        item = list_.item_set.get()
+        item.text = "buy bread"
+        item.save()
+        form = BulkItemsForm(for_list=list_, data={"items": "bread rolls"})
+        form.is_valid()
+        form.save()
+        self.assertEqual(search_items(self.user, "milk"), [])
+        self.assertEqual(len(search_items(self.user, "bread")), 2)
+        list_.item_set.all().delete()
+        self.assertEqual(search_items(self.user, "bread"), [])
+
+    def test_ranks_better_matches_first(self):
+        list_ = List.create_new(
+            first_item_text="tea and biscuits and cake and scones", owner=self.user
+        )
+        Item.objects.create(list=list_, text="tea tea")
+        results = search_items(self.user, "tea")
+        self.assertEqual(results[0].text, "tea tea")
+
+    def test_pages_after_cursor(self):
+        list_ = List.create_new(first_item_text="item 0", owner=self.user)
+        for i in range(1, 5):
+            Item.objects.create(list=list_, text=f"item {i}")
+        first = search_items(self.user, "item", limit=3)
+        after = parse_search_cursor(search_cursor(first[-1]))
+        rest = search_items(self.user, "item", after=after, limit=3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(rest), 2)
+        self.assertFalse({item.id for item in first} & {item.id for item in rest})
+
+    def test_searches_in_one_query(self):
+        List.create_new(first_item_text="buy milk", owner=self.user)
+        with self.assertNumQueries(1):
+            search_items(self.user, "milk")
+
+    def test_users_with_many_lists_only_see_their_own(self):
+        for n in range(150):
+            List.create_new(first_item_text=f"milk {n}", owner=self.user)
+            List.create_new(first_item_text=f"spilt milk {n}", owner=self.other)
+        shared = List.create_new(first_item_text="milk the cow", owner=self.other)
+        shared.shared_with.add(self.user)
+        results = search_items(self.user, "milk", limit=200)
+        self.assertEqual(len(results), 151)
+        self.assertEqual(
+            {item.list.owner for item in results if item.list_id != shared.id},
+            {self.user},
+        )
+
+    def test_index_holds_only_the_text(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM lists_item_fts LIMIT 0")
+            self.assertEqual([column[0] for column in cursor.description], ["text"])
+
+    def test_user_without_lists_finds_nothing(self):
+        List.create_new(first_item_text="spilt milk", owner=self.other)
+        self.assertEqual(search_items(self.user, "milk"), [])
+
+
+class SearchCursorTest(TestCase):
+    def test_round_trips_rank_and_id(self):
+        item = Mock(rank=-1.0126564986, id=42)
+        self.assertEqual(parse_search_cursor(search_cursor(item)), (item.rank, 42))
+
+    def test_returns_none_for_missing_or_invalid_values(self):
+        for value in (None, "", "1.5", "abc:1", "1.5:abc"):
+            self.assertIsNone(parse_search_cursor(value))
+
+
+class SearchViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="edith@example.com")
+        self.client.force_login(self.user)
+
+    def test_uses_search_template(self):
+        response = self.client.get("/lists/search?q=milk")
+        self.assertTemplateUsed(response, "search.html")
+
+    def test_shows_results_linking_to_lists(self):
+        list_ = List.create_new(first_item_text="buy milk", owner=self.user)
+        response = self.client.get("/lists/search?q=milk")
+        self.assertContains(response, f'href="/lists/{list_.id}/"')
+        self.assertContains(response, "buy milk")
+
+    def test_paginates_results(self):
+        list_ = List.create_new(first_item_text="item 0", owner=self.user)
+        for i in range(1, SEARCH_PAGE_SIZE + 1):
+            Item.objects.create(list=list_, text=f"item {i}")
+        response = self.client.get("/lists/search?q=item")
+        self.assertEqual(len(response.context["results"]), SEARCH_PAGE_SIZE)
+        cursor = response.context["next_cursor"]
+        self.assertContains(response, f"after={quote(cursor)}")
+        response = self.client.get("/lists/search", {"q": "item", "after": cursor})
+        self.assertEqual(len(response.context["results"]), 1)
+        self.assertNotIn("next_cursor", response.context)
+
+    def test_anonymous_users_get_no_results(self):
+        List.create_new(first_item_text="buy milk")
+        self.client.logout()
+        response = self.client.get("/lists/search?q=milk")
+        self.assertEqual(response.context["results"], [])
+        self.assertContains(response, "Log in to search")
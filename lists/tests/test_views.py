@@ -1,3 +1,4 @@
+import time
 import unittest
 from unittest.mock import Mock, patch
 
@@ -6,11 +7,14 @@ from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from django.utils.datastructures import MultiValueDict
 from django.utils.html import escape
+from django.utils.http import http_date
 
 from lists.forms import (DUPLICATE_ITEM_ERROR, EMPTY_ITEM_ERROR, ExistingListItemForm,
                          ItemForm)
 from lists.models import Item, List
-from lists.views import SHARE_LIST_FAIL, SHARE_LIST_SUCCESS, NewListView
+from lists.views import (BULK_ADD_REPEATED, BULK_ADD_SKIPPED, BULK_ADD_SUCCESS,
+                         ITEMS_PAGE_SIZE, MY_LISTS_PAGE_SIZE, SHARE_LIST_FAIL,
+                         SHARE_LIST_SUCCESS, SHARE_LIST_UNKNOWN, NewListView)
 
 User = get_user_model()
 
@@ -116,6 +120,111 @@ class ListViewTest(TestCase):
         response = self.client.get(f"/lists/{list_.pk}/")
         self.assertNotContains(response, escape(EMPTY_ITEM_ERROR))
 
+    def create_items(self, list_, count):
+        Item.objects.bulk_create(
+            Item(list=list_, text=f"item {i}") for i in range(count)
+        )
+        return list(list_.item_set.all())
+
+    def test_large_lists_are_paginated_by_cursor(self):
+        list_ = List.objects.create()
+        items = self.create_items(list_, ITEMS_PAGE_SIZE + 2)
+
+        response = self.client.get(f"/lists/{list_.id}/")
+        page = response.context["items"]
+        self.assertEqual(list(page), items[:ITEMS_PAGE_SIZE])
+        self.assertContains(response, f"?after={page.next_numbered_cursor}")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                f"/lists/{list_.id}/?after={page.next_numbered_cursor}"
+            )
+        self.assertEqual(list(response.context["items"]), items[ITEMS_PAGE_SIZE:])
+        self.assertContains(
+            response, f"{ITEMS_PAGE_SIZE + 1}: item {ITEMS_PAGE_SIZE}"
+        )
+        self.assertNotContains(response, 'id="id_items_next"')
+
+    def test_streamed_list_contains_all_items_in_order(self):
+        list_ = List.objects.create()
+        self.create_items(list_, ITEMS_PAGE_SIZE + 2)
+
+        response = self.client.get(f"/lists/{list_.id}/?stream=1")
+        content = b"".join(response.streaming_content).decode()
+
+        rows = [
+            f"<tr><td>{i + 1}: item {i}</td></tr>"
+            for i in range(ITEMS_PAGE_SIZE + 2)
+        ]
+        self.assertIn("".join(rows), content)
+        self.assertIn('id="id_list_table"', content)
+        self.assertIn('name="text"', content)
+        self.assertNotIn("superlists:items", content)
+
+    def test_streamed_rows_are_escaped(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text="<b>bold</b>")
+        response = self.client.get(f"/lists/{list_.id}/?stream=1")
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn(escape("<b>bold</b>"), content)
+
+
+class ListViewConditionalGetTest(TestCase):
+    def setUp(self):
+        self.list_ = List.create_new(first_item_text="item")
+        self.url = f"/lists/{self.list_.id}/"
+        self.client.get(self.url)  # picks up the CSRF cookie
+
+    def test_get_sends_etag_but_no_last_modified(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_if_modified_since_alone_is_ignored(self):
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_repeated_get_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_adding_item_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        Item.objects.create(list=self.list_, text="another item")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "another item")
+
+    def test_sharing_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.list_.shared_with.add(User.objects.create(email="a@b.com"))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_logging_in_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.force_login(User.objects.create(email="a@b.com"))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_pending_messages_are_always_rendered(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.post(
+            f"/lists/{self.list_.id}/share",
+            data={"shared_with": "nobody@example.com"},
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, escape(SHARE_LIST_FAIL))
+
+    def test_missing_list_is_not_found(self):
+        response = self.client.get("/lists/999/", HTTP_IF_NONE_MATCH='W/"abc"')
+        self.assertEqual(response.status_code, 404)
+
 
 class NewListViewIntegratedTest(TestCase):
     def test_can_save_a_post_request(self):
@@ -211,6 +320,77 @@ class MyListsTest(TestCase):
         response = self.client.get("/lists/users/a@b.com/")
         self.assertEqual(response.context["owner"], correct_user)
 
+    def create_lists(self, count, owner=None, shared_with=None):
+        lists = [
+            List.create_new(first_item_text=f"item {i}", owner=owner)
+            for i in range(count)
+        ]
+        if shared_with:
+            shared_with.shared_lists.add(*lists)
+        return lists
+
+    def test_displays_owned_and_shared_list_names(self):
+        owner = User.objects.create(email="a@b.com")
+        other = User.objects.create(email="c@d.com")
+        List.create_new(first_item_text="mine", owner=owner)
+        shared = List.create_new(first_item_text="theirs", owner=other)
+        shared.shared_with.add(owner)
+        response = self.client.get("/lists/users/a@b.com/")
+        self.assertContains(response, "mine")
+        self.assertContains(response, "theirs")
+
+    def test_query_count_does_not_grow_with_number_of_lists(self):
+        owner = User.objects.create(email="a@b.com")
+        other = User.objects.create(email="c@d.com")
+        self.create_lists(1, owner=owner)
+        self.create_lists(1, owner=other, shared_with=owner)
+        with self.assertNumQueries(3):
+            self.client.get("/lists/users/a@b.com/")
+
+        self.create_lists(20, owner=owner)
+        self.create_lists(20, owner=other, shared_with=owner)
+        with self.assertNumQueries(3):
+            self.client.get("/lists/users/a@b.com/")
+
+    def test_owned_lists_are_paginated_by_cursor(self):
+        owner = User.objects.create(email="a@b.com")
+        lists = self.create_lists(MY_LISTS_PAGE_SIZE + 1, owner=owner)
+
+        response = self.client.get("/lists/users/a@b.com/")
+        page = response.context["owned_lists"]
+        self.assertEqual(list(page), lists[:MY_LISTS_PAGE_SIZE])
+        self.assertEqual(page.next_cursor, lists[MY_LISTS_PAGE_SIZE - 1].id)
+
+        response = self.client.get(
+            f"/lists/users/a@b.com/?owned_after={page.next_cursor}"
+        )
+        page = response.context["owned_lists"]
+        self.assertEqual(list(page), lists[MY_LISTS_PAGE_SIZE:])
+        self.assertIsNone(page.next_cursor)
+
+    def test_shared_lists_are_paginated_by_cursor(self):
+        owner = User.objects.create(email="a@b.com")
+        other = User.objects.create(email="c@d.com")
+        lists = self.create_lists(
+            MY_LISTS_PAGE_SIZE + 1, owner=other, shared_with=owner
+        )
+
+        response = self.client.get("/lists/users/a@b.com/")
+        page = response.context["shared_lists"]
+        self.assertEqual(list(page), lists[:MY_LISTS_PAGE_SIZE])
+        self.assertContains(response, f"?shared_after={page.next_cursor}")
+
+        response = self.client.get(
+            f"/lists/users/a@b.com/?shared_after={page.next_cursor}"
+        )
+        self.assertEqual(list(response.context["shared_lists"]), lists[-1:])
+
+    def test_invalid_cursor_shows_first_page(self):
+        owner = User.objects.create(email="a@b.com")
+        lists = self.create_lists(2, owner=owner)
+        response = self.client.get("/lists/users/a@b.com/?owned_after=abc")
+        self.assertEqual(list(response.context["owned_lists"]), lists)
+
 
 class ShareListTest(TestCase):
     def test_get_redirects_to_lists_page(self):
@@ -284,4 +464,119 @@ class ShareListTest(TestCase):
         )
         self.assertEqual(message.tags, "error")
 
+    def test_shares_with_many_users_and_reports_unknown_emails(self):
+        users = [User.objects.create(email=f"user{i}@example.com") for i in range(3)]
+        list_: List = List.objects.create()
+        emails = [user.email for user in users] + ["nobody@example.com"]
+        response = self.client.post(
+            f"/lists/{list_.pk}/share",
+            data={"shared_with": ", ".join(emails)},
+            follow=True,
+        )
+        self.assertEqual(set(list_.shared_with.all()), set(users))
+        success, unknown = list(response.context["messages"])
+        self.assertEqual(success.message, SHARE_LIST_SUCCESS)
+        self.assertEqual(
+            unknown.message, SHARE_LIST_UNKNOWN.format(emails="nobody@example.com")
+        )
+        self.assertEqual(unknown.tags, "error")
+
     # TODO: def test_unauthenticated_cant_share_list(self):
+
+
+class BulkAddItemsTest(TestCase):
+    def post_items(self, list_, items):
+        return self.client.post(
+            f"/lists/{list_.pk}/bulk", data={"items": items}, follow=True
+        )
+
+    def test_list_page_shows_bulk_form(self):
+        list_ = List.objects.create()
+        response = self.client.get(f"/lists/{list_.pk}/")
+        self.assertContains(response, f'action="/lists/{list_.pk}/bulk"')
+        self.assertContains(response, 'name="items"')
+
+    def test_adds_items_and_redirects_to_list(self):
+        list_ = List.objects.create()
+        response = self.post_items(list_, "one\ntwo")
+        self.assertRedirects(response, f"/lists/{list_.pk}/")
+        self.assertEqual([item.text for item in list_.item_set.all()], ["one", "two"])
+        message = list(response.context["messages"])[0]
+        self.assertEqual(message.message, BULK_ADD_SUCCESS.format(count=2))
+        self.assertEqual(message.tags, "success")
+
+    def test_reports_skipped_duplicates(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text="one")
+        response = self.post_items(list_, "one\ntwo")
+        messages = list(response.context["messages"])
+        self.assertEqual(messages[0].message, BULK_ADD_SUCCESS.format(count=1))
+        self.assertIn("one", messages[1].message)
+        self.assertEqual(messages[1].tags, "error")
+
+    def test_reports_repeated_lines_separately(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text="one")
+        response = self.post_items(list_, "one\ntwo\ntwo")
+        messages = [message.message for message in response.context["messages"]]
+        self.assertEqual(
+            messages,
+            [
+                BULK_ADD_SUCCESS.format(count=1),
+                BULK_ADD_SKIPPED.format(count=1, items="one"),
+                BULK_ADD_REPEATED.format(count=1, items="two"),
+            ],
+        )
+
+    def test_error_message_on_empty_input(self):
+        list_ = List.objects.create()
+        response = self.post_items(list_, "")
+        message = list(response.context["messages"])[0]
+        self.assertEqual(message.tags, "error")
+        self.assertEqual(list_.item_set.count(), 0)
+
+
+class QueryCountTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create(email="owner@example.com")
+        User.objects.create(email="sharee@example.com")
+        self.list_ = List.create_new(first_item_text="item", owner=self.owner)
+        self.list_.shared_with.add(self.owner)
+        self.url = f"/lists/{self.list_.id}/"
+
+    def test_home_page(self):
+        with self.assertNumQueries(0):
+            self.client.get("/")
+
+    def test_new_list(self):
+        # list insert, item insert, list name/version update
+        with self.assertNumQueries(3):
+            self.client.post("/lists/new", data={"text": "new item"})
+
+    def test_view_list(self):
+        # list with its owner, items, sharees
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    def test_add_item_to_list(self):
+        # list, then the item insert and version update inside a savepoint
+        with self.assertNumQueries(5):
+            self.client.post(self.url, data={"text": "new item"})
+
+    def test_my_lists(self):
+        # user, owned lists, shared lists
+        with self.assertNumQueries(3):
+            self.client.get("/lists/users/owner@example.com/")
+
+    def test_share_list(self):
+        # list, sharee, existing shares, share insert, version update
+        with self.assertNumQueries(5):
+            self.client.post(
+                f"{self.url}share", data={"shared_with": "sharee@example.com"}
+            )
+
+    def test_bulk_add_items(self):
+        # list, then existing texts, bulk insert and version update inside a
+        # savepoint
+        with self.assertNumQueries(6):
+            self.client.post(f"{self.url}bulk", data={"items": "one\ntwo\nthree"})
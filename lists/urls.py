@@ -4,7 +4,20 @@ from lists import views
 
 urlpatterns = [
     url(r"^new$", views.NewListView.as_view(), name="new_list"),
+    url(r"^search$", views.SearchView.as_view(), name="search"),
     url(r"^(?P<pk>\d+)/$", views.CreateOrExistingListView.as_view(), name="view_list"),
     url(r"^users/(?P<pk>.+)/$", views.MyListsView.as_view(), name="my_lists"),
     url(r"^(?P<pk>\d+)/share$", views.ShareListView.as_view(), name="share_list"),
+    url(r"^(?P<pk>\d+)/bulk$", views.BulkAddItemsView.as_view(), name="bulk_add_items"),
 ]
+
+# Most queries per request, including loading the session and user; checked
+# by the tests with superlists.query_budgets
+QUERY_BUDGETS = {
+    "new_list": 5,
+    "search": 3,
+    "view_list": {"GET": 5, "POST": 5},
+    "my_lists": 5,
+    "share_list": 5,
+    "bulk_add_items": 6,
+}
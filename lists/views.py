@@ -1,34 +1,155 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import redirect
-from django.views.generic import CreateView, DetailView, FormView, RedirectView
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
+from django.utils.html import format_html
+from django.views.decorators.http import condition
+from django.views.generic import (CreateView, DetailView, FormView, RedirectView,
+                                  TemplateView)
+from django.views.generic.detail import SingleObjectMixin
 from django.views.generic.edit import ModelFormMixin
 
-from lists.forms import ExistingListItemForm, ItemForm, NewListForm, ShareListForm
+from lists.forms import (BulkItemsForm, ExistingListItemForm, ItemForm, NewListForm,
+                         ShareListForm)
+from lists.identity_map import identity_map
 from lists.models import List
+from lists.pagination import (KeysetPage, iter_keyset_chunks, parse_cursor,
+                              parse_numbered_cursor)
+from lists.search import parse_search_cursor, search_cursor, search_items
 
 SHARE_LIST_SUCCESS = "The list has been successfully shared."
 SHARE_LIST_FAIL = "Given email is invalid or doesn't exist in Superlists."
+SHARE_LIST_UNKNOWN = "These emails don't exist in Superlists: {emails}"
+BULK_ADD_SUCCESS = "Added {count} items to the list."
+BULK_ADD_SKIPPED = "Skipped {count} items already in the list: {items}"
+BULK_ADD_REPEATED = "Skipped {count} items repeated in the input: {items}"
+BULK_ADD_SKIPPED_SHOWN = 10
+BULK_ADD_FAIL = "Couldn't add these items: {errors}"
+MY_LISTS_PAGE_SIZE = 50
+ITEMS_PAGE_SIZE = 500
+SEARCH_PAGE_SIZE = 20
+ITEMS_STREAM_CHUNK_SIZE = 1000
+# Marks where streamed item rows go; item text is escaped, so it can't forge it.
+ITEMS_STREAM_MARKER = "<!-- superlists:items -->"
 
 User = get_user_model()
 
 
+def list_etag(request, pk):
+    """ETag of the list page, or None if it can't be cached.
+
+    There is deliberately no Last-Modified: dates have a resolution of one
+    second and can't vary with the visitor, so only the ETag is used.
+    Pages with pending messages are always rendered, so the messages get shown.
+    """
+    if len(messages.get_messages(request)):
+        return None
+    try:
+        list_ = identity_map(request).get(List.objects.select_related("owner"), pk)
+    except List.DoesNotExist:
+        return None
+    # The page also shows who is logged in and embeds a CSRF token, both tied
+    # to the visitor's cookies.
+    key = ":".join(
+        [
+            pk,
+            str(list_.version),
+            request.COOKIES.get(settings.SESSION_COOKIE_NAME, ""),
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        ]
+    )
+    return 'W/"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+
+class IdentityMapObjectMixin(object):
+    """Load the view's object through the request's identity map."""
+
+    def get_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+        try:
+            return identity_map(self.request).get(
+                queryset, self.kwargs[self.pk_url_kwarg]
+            )
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {queryset.model._meta.verbose_name} found")
+
+
 class HomePageView(FormView):
     template_name = "home.html"
     form_class = ItemForm
 
 
 # TODO: Use class inheritance to switch between forms?
-class CreateOrExistingListView(DetailView, CreateView):
+@method_decorator(
+    condition(etag_func=list_etag),
+    name="get",
+)
+class CreateOrExistingListView(IdentityMapObjectMixin, DetailView, CreateView):
     model = List
+    # The page always shows the owner
+    queryset = List.objects.select_related("owner")
     template_name = "list.html"
+    reads_from_replica = True
     form_class = ExistingListItemForm
 
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("stream"):
+            return self.stream_response()
+        return super().get(request, *args, **kwargs)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["share_list_form"] = ShareListForm(for_list=self.object)
+        context["share_list_form"] = ShareListForm(
+            for_list=self.object, identity_map=identity_map(self.request)
+        )
+        context["bulk_items_form"] = BulkItemsForm(for_list=self.object)
+        after, offset = self.get_item_cursor()
+        context["items"] = KeysetPage(
+            self.object.item_set.only("id", "text", "list"),
+            after=after,
+            size=ITEMS_PAGE_SIZE,
+            offset=offset,
+        )
         return context
 
+    def get_item_cursor(self):
+        return parse_numbered_cursor(self.request.GET.get("after"))
+
+    def stream_response(self):
+        """Render the page around the items, then stream item rows in chunks."""
+        self.object = self.get_object()
+        context = self.get_context_data(object=self.object, stream_items=True)
+        page = render_to_string(self.template_name, context, request=self.request)
+        head, tail = page.split(ITEMS_STREAM_MARKER)
+        rows = self.object.item_set.values_list("id", "text")
+        after, offset = self.get_item_cursor()
+
+        def content():
+            yield head
+            batch = []
+            for number, (_, text) in enumerate(
+                iter_keyset_chunks(rows, after, ITEMS_STREAM_CHUNK_SIZE),
+                start=offset + 1,
+            ):
+                batch.append(format_html("<tr><td>{}: {}</td></tr>", number, text))
+                if len(batch) == ITEMS_STREAM_CHUNK_SIZE:
+                    yield "".join(batch)
+                    batch = []
+            yield "".join(batch) + tail
+
+        return StreamingHttpResponse(content())
+
+    def form_valid(self, form):
+        if form.save() is None:
+            return self.form_invalid(form)
+        return redirect(self.object)
+
     def get_form(self):
         self.object = self.get_object()
         if self.request.POST:
@@ -45,19 +166,41 @@ class NewListView(CreateView):
         return redirect(self.object)
 
 
-class MyListsView(DetailView):
+class MyListsView(IdentityMapObjectMixin, DetailView):
     model = User
     template_name = "my_lists.html"
+    reads_from_replica = True
     context_object_name = "owner"
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["owned_lists"] = self._page(
+            List.objects.filter(owner=self.object), "owned_after"
+        )
+        context["shared_lists"] = self._page(
+            self.object.shared_lists.all(), "shared_after"
+        )
+        return context
+
+    def _page(self, queryset, cursor_param):
+        return KeysetPage(
+            queryset.only("id", "name"),
+            after=parse_cursor(self.request.GET.get(cursor_param)),
+            size=MY_LISTS_PAGE_SIZE,
+        )
+
 
-class ShareListView(ModelFormMixin, RedirectView):
+class ShareListView(IdentityMapObjectMixin, ModelFormMixin, RedirectView):
     model = List
     form_class = ShareListForm
     pattern_name = "view_list"
 
     def get_form(self) -> ShareListForm:
-        return self.form_class(for_list=self.get_object(), data=self.request.POST)
+        return self.form_class(
+            for_list=self.get_object(),
+            data=self.request.POST,
+            identity_map=identity_map(self.request),
+        )
 
     def post(self, request, *args, **kwargs):
         form = self.get_form()
@@ -66,6 +209,11 @@ class ShareListView(ModelFormMixin, RedirectView):
                 self.request,
                 SHARE_LIST_SUCCESS,
             )
+            if form.unknown_emails:
+                messages.error(
+                    self.request,
+                    SHARE_LIST_UNKNOWN.format(emails=", ".join(form.unknown_emails)),
+                )
             return self.form_valid(form)
 
         messages.error(
@@ -73,3 +221,52 @@ class ShareListView(ModelFormMixin, RedirectView):
             SHARE_LIST_FAIL,
         )
         return super().post(request, *args, **kwargs)
+
+
+class BulkAddItemsView(IdentityMapObjectMixin, SingleObjectMixin, RedirectView):
+    model = List
+    form_class = BulkItemsForm
+    pattern_name = "view_list"
+
+    def post(self, request, *args, **kwargs):
+        form = self.form_class(for_list=self.get_object(), data=request.POST)
+        added = form.save() if form.is_valid() else None
+        if added is not None:
+            messages.success(request, BULK_ADD_SUCCESS.format(count=len(added)))
+            if form.skipped:
+                messages.error(
+                    request, self.skipped_message(BULK_ADD_SKIPPED, form.skipped)
+                )
+            if form.repeated:
+                messages.error(
+                    request, self.skipped_message(BULK_ADD_REPEATED, form.repeated)
+                )
+        else:
+            errors = " ".join(form.errors["items"])
+            messages.error(request, BULK_ADD_FAIL.format(errors=errors))
+        return super().post(request, *args, **kwargs)
+
+    def skipped_message(self, message, skipped):
+        items = ", ".join(skipped[:BULK_ADD_SKIPPED_SHOWN])
+        if len(skipped) > BULK_ADD_SKIPPED_SHOWN:
+            items += f" and {len(skipped) - BULK_ADD_SKIPPED_SHOWN} more"
+        return message.format(count=len(skipped), items=items)
+
+
+class SearchView(TemplateView):
+    template_name = "search.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get("q", "")
+        results = search_items(
+            self.request.user,
+            query,
+            after=parse_search_cursor(self.request.GET.get("after")),
+            limit=SEARCH_PAGE_SIZE + 1,
+        )
+        context["query"] = query
+        context["results"] = results[:SEARCH_PAGE_SIZE]
+        if len(results) > SEARCH_PAGE_SIZE:
+            context["next_cursor"] = search_cursor(results[SEARCH_PAGE_SIZE - 1])
+        return context
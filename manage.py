@@ -2,8 +2,23 @@
 import os
 import sys
 
+# functional_tests/management/commands, and test, which runs functional_tests
+TEST_TOOLS_COMMANDS = {
+    "bench",
+    "bench_functional_tests",
+    "bench_sessions",
+    "bench_startup",
+    "create_session",
+    "seed_data",
+    "test",
+}
+
 if __name__ == "__main__":
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "superlists.settings")
+    # Make test-only apps, like functional_tests, available to the commands
+    # that need them, but not to those run in production, like migrate
+    if sys.argv[1:2] and sys.argv[1] in TEST_TOOLS_COMMANDS:
+        os.environ.setdefault("DJANGO_TEST_TOOLS", "y")
     try:
         from django.core.management import execute_from_command_line
     except ImportError:
@@ -0,0 +1,281 @@
+"""Request metrics, exposed in the Prometheus text format.
+
+Each server process keeps its own histograms. With ``METRICS_DIR`` set, every
+process also writes them to a file of its own there, at most once every
+``WRITE_INTERVAL`` seconds and when a gunicorn worker exits, and ``/metrics``
+reports the sum over all the files. Whichever worker answers the scrape, it
+sees the whole site. When a worker has exited, gunicorn's master folds its
+file into ``exited.json``, so the totals never go backwards and the directory
+holds one file per live worker plus that one. The directory is cleared when
+gunicorn starts, and Prometheus treats that reset like any other restart.
+"""
+import bisect
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+
+from lists import fragment_cache
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# Seconds between writes of a process's file in METRICS_DIR
+WRITE_INTERVAL = 1.0
+EXITED_FILE = "exited.json"
+
+
+class Histogram(object):
+    """Counts of observed values in buckets, by view."""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, view, value):
+        with self._lock:
+            series = self._series.get(view)
+            if series is None:
+                # A count per bucket, then the +Inf bucket, sum and count
+                series = self._series[view] = [0] * (len(self.buckets) + 1) + [0, 0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {view: list(values) for view, values in self._series.items()}
+
+    def render(self, series=None):
+        """Text format lines for ``series``, by default this process's own."""
+        if series is None:
+            series = self.snapshot()
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for view, values in sorted(series.items()):
+            label = f'view="{_escape(view)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label}}} {values[-1]}")
+        return lines
+
+
+def _escape(value):
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+request_duration = Histogram(
+    "superlists_request_duration_seconds",
+    "Time to handle a request.",
+    DURATION_BUCKETS,
+)
+db_duration = Histogram(
+    "superlists_db_duration_seconds",
+    "Time spent in database queries per request.",
+    DURATION_BUCKETS,
+)
+db_queries = Histogram(
+    "superlists_db_queries",
+    "Database queries per request.",
+    QUERY_BUCKETS,
+)
+template_duration = Histogram(
+    "superlists_template_duration_seconds",
+    "Time to render a request's template response.",
+    DURATION_BUCKETS,
+)
+HISTOGRAMS = [request_duration, db_duration, db_queries, template_duration]
+
+
+_file_lock = threading.Lock()
+_process_file = {}
+_writes_lock = threading.Lock()
+_writes = {"at": None, "timer": None}
+
+
+def observe_request(view, duration, db_time, queries, template_time=None):
+    request_duration.observe(view, duration)
+    db_duration.observe(view, db_time)
+    db_queries.observe(view, queries)
+    if template_time is not None:
+        template_duration.observe(view, template_time)
+    if settings.METRICS_DIR:
+        write_soon(settings.METRICS_DIR)
+
+
+def write_soon(metrics_dir):
+    """Write this process's file now, or once ``WRITE_INTERVAL`` is up.
+
+    A later write picks up every request since, so at most one is pending.
+    """
+    with _writes_lock:
+        if _writes["timer"] is not None:
+            return
+        now = time.monotonic()
+        delay = 0 if _writes["at"] is None else _writes["at"] + WRITE_INTERVAL - now
+        if delay > 0:
+            timer = threading.Timer(delay, _write_pending, [metrics_dir])
+            timer.daemon = True
+            _writes["timer"] = timer
+            timer.start()
+            return
+        _writes["at"] = now
+    write_snapshot(metrics_dir)
+
+
+def _write_pending(metrics_dir):
+    with _writes_lock:
+        _writes.update(at=time.monotonic(), timer=None)
+    write_snapshot(metrics_dir)
+
+
+def reset():
+    for histogram in HISTOGRAMS:
+        histogram.reset()
+    with _writes_lock:
+        if _writes["timer"] is not None:
+            _writes["timer"].cancel()
+        _writes.update(at=None, timer=None)
+
+
+def snapshot():
+    """This process's metrics, as written to its file in ``METRICS_DIR``."""
+    return {
+        "histograms": {
+            histogram.name: histogram.snapshot() for histogram in HISTOGRAMS
+        },
+        "fragments": fragment_cache.stats(),
+    }
+
+
+def process_file(metrics_dir):
+    # Unique to this process, so a new worker that gets an old worker's pid
+    # doesn't overwrite its totals
+    pid = os.getpid()
+    if _process_file.get("pid") != pid:
+        _process_file.update(pid=pid, name=f"{pid}-{uuid.uuid4().hex}.json")
+    return os.path.join(metrics_dir, _process_file["name"])
+
+
+def write_snapshot(metrics_dir):
+    path = process_file(metrics_dir)
+    with _file_lock:
+        data = json.dumps(snapshot())
+        with open(path + ".tmp", "w") as f:
+            f.write(data)
+        # Readers only ever see a complete file
+        os.replace(path + ".tmp", path)
+
+
+@contextmanager
+def _locked(metrics_dir, operation):
+    """Lock ``metrics_dir`` between readers and ``fold_exited``."""
+    with open(os.path.join(metrics_dir, ".lock"), "a") as lock:
+        fcntl.flock(lock, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # Gone or cleared since listing the directory
+
+
+def read_snapshots(metrics_dir, skip=None):
+    """The metrics in every file of ``metrics_dir`` but ``skip``."""
+    snapshots = []
+    with _locked(metrics_dir, fcntl.LOCK_SH):
+        for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+            if path != skip:
+                data = _read(path)
+                if data is not None:
+                    snapshots.append(data)
+    return snapshots
+
+
+def fold_exited(metrics_dir, pid):
+    """Add the file of the exited process ``pid`` into ``EXITED_FILE``.
+
+    Run by gunicorn's master from its ``child_exit`` hook; readers wait, so
+    they never count the file twice or not at all.
+    """
+    exited = os.path.join(metrics_dir, EXITED_FILE)
+    with _locked(metrics_dir, fcntl.LOCK_EX):
+        paths = glob.glob(os.path.join(metrics_dir, f"{pid}-*.json"))
+        if not paths:
+            return
+        snapshots = [_read(path) for path in [exited] + paths]
+        data = json.dumps(merge(data for data in snapshots if data is not None))
+        with open(exited + ".tmp", "w") as f:
+            f.write(data)
+        os.replace(exited + ".tmp", exited)
+        for path in paths:
+            os.remove(path)
+
+
+def merge(snapshots):
+    """The sum of the metrics of several processes."""
+    total = {"histograms": {}, "fragments": {}}
+    for snapshot in snapshots:
+        for name, series in snapshot["histograms"].items():
+            merged = total["histograms"].setdefault(name, {})
+            for view, values in series.items():
+                if view in merged:
+                    merged[view] = [a + b for a, b in zip(merged[view], values)]
+                else:
+                    merged[view] = list(values)
+        for fragment, counts in snapshot["fragments"].items():
+            merged = total["fragments"].setdefault(fragment, {"hits": 0, "misses": 0})
+            for outcome, count in counts.items():
+                merged[outcome] += count
+    return total
+
+
+def render():
+    if settings.METRICS_DIR:
+        # This process's own numbers may be newer than its file
+        others = read_snapshots(
+            settings.METRICS_DIR, skip=process_file(settings.METRICS_DIR)
+        )
+        data = merge(others + [snapshot()])
+    else:
+        data = snapshot()
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render(data["histograms"].get(histogram.name, {})))
+    for outcome in ("hits", "misses"):
+        name = f"superlists_fragment_cache_{outcome}_total"
+        lines.append(f"# HELP {name} List page fragment cache {outcome}.")
+        lines.append(f"# TYPE {name} counter")
+        for fragment, counts in sorted(data["fragments"].items()):
+            lines.append(f'{name}{{fragment="{_escape(fragment)}"}} {counts[outcome]}')
+    return "\n".join(lines) + "\n"
+
+
+class MetricsView(View):
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(render(), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,41 @@
+"""Test tooling that holds views to the query budgets declared in urls.py.
+
+Each urls module declares ``QUERY_BUDGETS``, the most queries a request to
+each of its URL names may make: a number, or a dict of numbers by HTTP
+method. Tests make their requests through ``assertWithinQueryBudget``, which
+fails listing the SQL of a request over budget. Running the same request as
+the data grows from 1 to ``GROWTH_SIZES[-1]`` rows catches N+1 queries.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from superlists.urls import QUERY_BUDGETS
+
+GROWTH_SIZES = (1, 10)
+
+
+def query_budget(url_name, method):
+    budget = QUERY_BUDGETS[url_name]
+    if isinstance(budget, dict):
+        return budget[method.upper()]
+    return budget
+
+
+class QueryBudgetMixin(object):
+    def assertWithinQueryBudget(self, method, path, **kwargs):
+        """Make a request with the test client, checking its query count."""
+        url_name = resolve(path.split("?")[0]).url_name
+        budget = query_budget(url_name, method)
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(path, **kwargs)
+        if len(context) > budget:
+            queries = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(context.captured_queries, 1)
+            )
+            self.fail(
+                f"{method.upper()} {path} ({url_name}) made {len(context)} "
+                f"queries, over its budget of {budget}:\n{queries}"
+            )
+        return response
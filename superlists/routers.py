@@ -0,0 +1,111 @@
+"""Send reads from read-only views to replicas, everything else to the primary.
+
+Views opt in with ``reads_from_replica = True``; ``ReplicaRoutingMiddleware``
+then lets their GET and HEAD requests read from a replica. Any other request,
+or one that calls ``record_write``, pins its session to the primary for
+``REPLICA_STICKY_SECONDS``, so users see their own changes even if replicas
+are behind.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_UNTIL_SESSION_KEY = "_primary_until"
+
+_state = threading.local()
+_down_until = {}
+
+
+def record_write():
+    """Pin this session to the primary after a write from a safe method."""
+    _state.wrote = True
+
+
+@contextmanager
+def replica_reads():
+    """Let reads inside the block go to a replica, unless pinned to the primary."""
+    previous = getattr(_state, "read_only", False)
+    _state.read_only = True
+    try:
+        yield
+    finally:
+        _state.read_only = previous
+
+
+def healthy_replica():
+    """A replica that accepts connections, or ``None`` if none do.
+
+    A replica that fails to connect is skipped for ``REPLICA_RETRY_SECONDS``.
+    """
+    now = time.monotonic()
+    replicas = [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if _down_until.get(alias, 0) <= now
+    ]
+    random.shuffle(replicas)
+    for alias in replicas:
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            logger.warning("Replica %s is unavailable, reading from primary", alias)
+            _down_until[alias] = now + settings.REPLICA_RETRY_SECONDS
+            continue
+        return alias
+    return None
+
+
+class ReplicaRouter(object):
+    def db_for_read(self, model, **hints):
+        if not getattr(_state, "read_only", False) or getattr(_state, "pinned", False):
+            return DEFAULT_DB_ALIAS
+        # Stick to one replica for the rest of the request
+        if getattr(_state, "replica", None) is None:
+            _state.replica = healthy_replica() or DEFAULT_DB_ALIAS
+        return _state.replica
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware(object):
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        _state.__dict__.clear()
+        try:
+            writes = request.method not in ("GET", "HEAD", "OPTIONS")
+            primary_until = request.session.get(PRIMARY_UNTIL_SESSION_KEY, 0)
+            if writes or primary_until > time.time():
+                _state.pinned = True
+            response = self.get_response(request)
+            if writes or getattr(_state, "wrote", False):
+                request.session[PRIMARY_UNTIL_SESSION_KEY] = (
+                    time.time() + settings.REPLICA_STICKY_SECONDS
+                )
+        finally:
+            _state.__dict__.clear()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        if request.method in ("GET", "HEAD") and getattr(
+            view_class, "reads_from_replica", False
+        ):
+            _state.read_only = True
@@ -43,18 +43,30 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "lists",
-    "accounts",
-    "functional_tests",
+    "accounts.apps.AccountsConfig",
 ]
 
+# Functional tests and the benchmark and seeding commands are only used from
+# manage.py (which sets DJANGO_TEST_TOOLS for those commands only), never by
+# the production web server, so they stay off its import path.
+if DEBUG or "DJANGO_TEST_TOOLS" in os.environ:
+    INSTALLED_APPS.append("functional_tests")
+
+# Closes the functional tests' browsers, including in --parallel workers
+TEST_RUNNER = "functional_tests.runner.TestRunner"
+
 AUTH_USER_MODEL = "accounts.User"
+# Users log in with emailed links, so there are no passwords to validate
 AUTHENTICATION_BACKENDS = [
     "accounts.authentication.PasswordlessAuthenticationBackend",
 ]
 
 MIDDLEWARE = [
+    # First, so it times everything else
+    "superlists.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "superlists.routers.ReplicaRoutingMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -88,29 +100,83 @@ WSGI_APPLICATION = "superlists.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        # Django's sqlite3 backend, timing queries for superlists.timing
+        "ENGINE": "superlists.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
     }
 }
 
+if "DJANGO_DEBUG_FALSE" in os.environ:
+    # Gunicorn workers share the database file: WAL lets readers carry on
+    # while one of them writes, and connections are kept between requests.
+    DATABASES["default"].update(
+        {
+            "CONN_MAX_AGE": 600,
+            # Seconds to wait for another writer before "database is locked"
+            "OPTIONS": {"timeout": 20},
+            "PRAGMAS": {
+                "journal_mode": "wal",
+                # Safe with WAL; only the last commits can be lost on power loss
+                "synchronous": "normal",
+                "mmap_size": 64 * 1024 * 1024,
+                # Negative means KiB rather than pages
+                "cache_size": -16 * 1024,
+                "temp_store": "memory",
+            },
+        }
+    )
+
+# Read-only replicas of the database, as a comma-separated list of SQLite
+# files kept in sync with the primary (any copy will do for local testing).
+# Replica reads are opted into per view; see superlists/routers.py.
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+    filter(None, os.environ.get("DJANGO_DB_REPLICAS", "").split(",")), 1
+):
+    alias = f"replica{number}"
+    DATABASES[alias] = dict(
+        DATABASES["default"],
+        NAME=f"file:{path}?mode=ro",
+        OPTIONS=dict(DATABASES["default"].get("OPTIONS", {}), uri=True),
+        # Read-only connections can't change the journal mode
+        PRAGMAS={
+            name: value
+            for name, value in DATABASES["default"].get("PRAGMAS", {}).items()
+            if name != "journal_mode"
+        },
+        TEST={"MIRROR": "default"},
+    )
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["superlists.routers.ReplicaRouter"]
+# After a write, a session reads from the primary for this many seconds
+REPLICA_STICKY_SECONDS = 10
+# How long to stop using a replica that couldn't be reached
+REPLICA_RETRY_SECONDS = 30
+
+
+# Cache
+# https://docs.djangoproject.com/en/1.11/topics/cache/
+#
+# Without DJANGO_MEMCACHED each process has a cache of its own, which only
+# suits a single process (runserver, tests).
+if "DJANGO_MEMCACHED" in os.environ:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.MemcachedCache",
+            "LOCATION": os.environ["DJANGO_MEMCACHED"],
+        }
+    }
 
-# Password validation
-# https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
 
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",  # noqa
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
-    },
-]
+# Sessions
+# https://docs.djangoproject.com/en/1.11/topics/http/sessions/
+#
+# One of "db", "cached_db", "cache" or "signed_cookies". "cache" keeps sessions
+# only in CACHES, so it needs a cache shared by every server process; compare
+# the options with `manage.py bench_sessions`.
+SESSION_BACKEND = os.environ.get("DJANGO_SESSION_BACKEND", "db")
+SESSION_ENGINE = "django.contrib.sessions.backends." + SESSION_BACKEND
 
 
 # Internationalization
@@ -120,7 +186,8 @@ LANGUAGE_CODE = "en-us"
 
 TIME_ZONE = "UTC"
 
-USE_I18N = True
+# The site is only in English; this skips loading translation catalogs
+USE_I18N = False
 
 USE_L10N = True
 
@@ -131,7 +198,26 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/1.11/howto/static-files/
 
 STATIC_URL = "/static/"
-STATIC_ROOT = os.path.join(BASE_DIR, "static")
+STATIC_ROOT = os.environ.get("DJANGO_STATIC_ROOT", os.path.join(BASE_DIR, "static"))
+
+if not DEBUG:
+    # Hashed and precompressed copies of every file; `collectstatic` must run
+    # before the site can render pages.
+    STATICFILES_STORAGE = "superlists.storage.CompressedManifestStaticFilesStorage"
+
+# Resolve URLs and compile templates as soon as the WSGI app is loaded, and
+# connect to the databases as each gunicorn worker starts, instead of on the
+# first requests; see superlists/warmup.py
+WARM_UP_ON_LOAD = "DJANGO_WARM_UP" in os.environ
+
+# Where each server process writes its request metrics, so /metrics can report
+# the sum over all gunicorn workers; see superlists/metrics.py. Unset, /metrics
+# only shows the process that answers it.
+METRICS_DIR = os.environ.get("DJANGO_METRICS_DIR")
+
+# Rendered list page fragments are keyed by list version, so this only bounds
+# how long unused versions stay in the cache.
+LIST_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
 
 LOGGING = {
     "version": 1,
@@ -146,6 +232,9 @@ LOGGING = {
         "django": {
             "handlers": ["console"],
         },
+        "superlists": {
+            "handlers": ["console"],
+        },
     },
     "root": {"level": "INFO"},
 }
@@ -155,3 +244,21 @@ EMAIL_HOST_USER = "sh.bazarbay@gmail.com"
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_PASSWORD")
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
+
+# How long a login link stays valid, in seconds
+LOGIN_TOKEN_TTL = 60 * 60
+
+# Logged-in users are loaded from the cache. Entries are cleared whenever a
+# user is saved or deleted; these bound how long anything else can go stale.
+# Clearing only reaches other processes through a shared cache, so users
+# aren't cached by a production server without one.
+USER_CACHE_ENABLED = DEBUG or "DJANGO_MEMCACHED" in os.environ
+USER_CACHE_TIMEOUT = 60 * 15
+USER_CACHE_MISS_TIMEOUT = 60
+
+# Login emails are queued in the database and sent by
+# `manage.py send_queued_mail`.
+MAIL_QUEUE_BATCH_SIZE = 50
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+MAIL_QUEUE_RETRY_DELAY = 30  # seconds, doubled after each failed attempt
+MAIL_QUEUE_POLL_INTERVAL = 2  # seconds
@@ -0,0 +1,44 @@
+"""SQLite backend that applies the ``PRAGMAS`` database setting on connect.
+
+    DATABASES = {
+        "default": {
+            "ENGINE": "superlists.sqlite3",
+            "NAME": "db.sqlite3",
+            "PRAGMAS": {"journal_mode": "wal", "synchronous": "normal"},
+        }
+    }
+
+It also reports the time each query takes to ``superlists.timing``.
+"""
+import time
+
+from django.db.backends.sqlite3 import base
+
+from superlists import timing
+
+
+class TimedCursorWrapper(base.SQLiteCursorWrapper):
+    def execute(self, query, params=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, params)
+        finally:
+            timing.record_query(time.perf_counter() - start)
+
+    def executemany(self, query, param_list):
+        start = time.perf_counter()
+        try:
+            return super().executemany(query, param_list)
+        finally:
+            timing.record_query(time.perf_counter() - start)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get("PRAGMAS", {}).items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor(factory=TimedCursorWrapper)
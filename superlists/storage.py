@@ -0,0 +1,61 @@
+"""Static files storage that fingerprints files and precompresses them.
+
+``collectstatic`` writes each file under a name containing a hash of its
+content (``base.css`` becomes ``base.5af66c1b1797.css``), recorded in
+``staticfiles.json`` so ``{% static %}`` links to the current version.
+Alongside each compressible hashed file it writes ``.gz`` and, when the
+``brotli`` package is installed, ``.br`` copies for nginx to serve as they
+are (see deploy_tools/nginx.template.conf).
+"""
+import gzip
+import io
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    ".css", ".js", ".svg", ".map", ".txt", ".html", ".eot", ".ttf",
+)  # fmt: skip
+# Smaller files don't get much smaller, and cost a lookup either way
+MIN_COMPRESS_SIZE = 256
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if not dry_run and hashed_name and self.should_compress(hashed_name):
+                self.compress(hashed_name)
+            yield name, hashed_name, processed
+
+    def should_compress(self, name):
+        return name.endswith(COMPRESSIBLE_EXTENSIONS)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        compressed = {".gz": gzip_compress(content)}
+        if brotli is not None:
+            compressed[".br"] = brotli.compress(content)
+        for extension, data in compressed.items():
+            if len(data) >= len(content):
+                continue
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            self._save(name + extension, ContentFile(data))
+
+
+def gzip_compress(content):
+    # A fixed mtime, so unchanged files compress to identical bytes
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(content)
+    return buffer.getvalue()
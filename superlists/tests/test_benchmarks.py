@@ -0,0 +1,61 @@
+import json
+from contextlib import nullcontext
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from functional_tests.benchmarking import summarize
+
+
+class SummarizeTest(SimpleTestCase):
+    def test_throughput_comes_from_wall_clock_time(self):
+        # Four 10 ms requests over a whole second, e.g. with setup between them
+        summary = summarize([10, 10, 10, 10], [2, 2, 3, 3], elapsed=1.0)
+        self.assertEqual(summary["throughput_rps"], 4.0)
+        self.assertEqual(summary["p50_ms"], 10)
+        self.assertEqual(summary["queries"], 2.5)
+
+    def test_no_throughput_without_elapsed_time(self):
+        self.assertNotIn("throughput_rps", summarize([10], [1]))
+
+
+# The test runner has already set up a test database
+@patch("functional_tests.management.commands.bench.benchmark_database", nullcontext)
+class BenchCommandTest(TestCase):
+    def test_reports_each_view_as_json(self):
+        stdout = StringIO()
+        call_command(
+            "bench",
+            "--users=2",
+            "--lists-per-user=1",
+            "--items-per-list=2",
+            "--sharees=1",
+            "--requests=2",
+            "--view=home",
+            "--view=view_list",
+            "--view=add_item",
+            stdout=stdout,
+        )
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(sorted(report["views"]), ["add_item", "home", "view_list"])
+        for summary in report["views"].values():
+            self.assertEqual(summary["requests"], 2)
+            self.assertGreater(summary["throughput_rps"], 0)
+
+
+class BenchStartupCommandTest(SimpleTestCase):
+    def test_reports_cold_start_without_test_modules(self):
+        stdout = StringIO()
+        call_command("bench_startup", "--runs=1", "--profile=production", stdout=stdout)
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(list(report), ["production"])
+        summary = report["production"]
+        self.assertEqual(summary["runs"], 1)
+        self.assertEqual(summary["status"], "200 OK")
+        self.assertEqual(summary["test_modules"], [])
+        self.assertGreater(summary["import_ms"]["p50"], 0)
+        self.assertIn("p99", summary["first_query_ms"])
+        # Only measured with the warm-up
+        self.assertNotIn("connect_ms", summary)
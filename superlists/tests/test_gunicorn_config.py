@@ -0,0 +1,48 @@
+from contextlib import redirect_stdout
+from io import StringIO
+
+from django.test import SimpleTestCase
+
+from deploy_tools.gunicorn_config import MAX_THREADS, choose, main
+
+
+class ChooseTest(SimpleTestCase):
+    def test_enough_memory_gives_two_workers_per_cpu_plus_one(self):
+        self.assertEqual(choose(cpus=4, memory=16000), (9, 2))
+
+    def test_one_cpu_with_little_memory(self):
+        # 3 workers wanted, memory for 1; at least 2 run, with a thread more
+        self.assertEqual(choose(cpus=1, memory=256), (2, 3))
+
+    def test_many_cpus_with_little_memory(self):
+        # 33 workers wanted, memory for 6; threads make up for some of it
+        self.assertEqual(choose(cpus=16, memory=1024), (6, MAX_THREADS))
+
+    def test_never_fewer_than_two_workers_and_two_threads(self):
+        for cpus, memory in [(1, 0), (1, 100000), (64, 0), (64, 100000)]:
+            workers, threads = choose(cpus, memory)
+            self.assertGreaterEqual(workers, 2)
+            self.assertGreaterEqual(threads, 2)
+            self.assertLessEqual(threads, MAX_THREADS)
+
+
+class MainTest(SimpleTestCase):
+    def config(self, *args):
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            main(["--bind=unix:/tmp/test.sock", "--cpus=2", "--memory-mb=4096", *args])
+        return stdout.getvalue()
+
+    def test_writes_chosen_workers_and_threads(self):
+        config = self.config()
+        self.assertIn("workers = 5\n", config)
+        self.assertIn("threads = 2\n", config)
+        self.assertIn("worker_class = 'gthread'\n", config)
+
+    def test_one_thread_gives_sync_workers(self):
+        config = self.config("--threads=1")
+        self.assertIn("threads = 1\n", config)
+        self.assertIn("worker_class = 'sync'\n", config)
+
+    def test_config_compiles(self):
+        compile(self.config(), "gunicorn.conf.py", "exec")
@@ -0,0 +1,161 @@
+from unittest import mock
+
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Token, User
+from lists.models import List
+from superlists import routers
+from superlists.routers import ReplicaRouter, replica_reads
+
+
+class FakeConnections(dict):
+    def __init__(self, down=()):
+        super().__init__()
+        for alias in ("replica1", "replica2"):
+            self[alias] = mock.Mock()
+            if alias in down:
+                self[alias].ensure_connection.side_effect = OperationalError
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        routers._state.__dict__.clear()
+        routers._down_until.clear()
+        self.addCleanup(routers._state.__dict__.clear)
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(List), "default")
+
+    def test_replica_reads_go_to_one_replica(self):
+        with mock.patch.object(routers, "connections", FakeConnections()):
+            with replica_reads():
+                replica = self.router.db_for_read(List)
+                self.assertIn(replica, ["replica1", "replica2"])
+                self.assertEqual(self.router.db_for_read(User), replica)
+
+    def test_writes_go_to_primary(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(List), "default")
+
+    @mock.patch("superlists.routers.random.shuffle")
+    def test_unreachable_replica_is_skipped(self, shuffle):
+        with mock.patch.object(routers, "connections", FakeConnections({"replica1"})):
+            with replica_reads(), self.assertLogs("superlists.routers", "WARNING"):
+                self.assertEqual(self.router.db_for_read(List), "replica2")
+        self.assertIn("replica1", routers._down_until)
+
+    def test_falls_back_to_primary_when_no_replica_is_reachable(self):
+        down = {"replica1", "replica2"}
+        with mock.patch.object(routers, "connections", FakeConnections(down)):
+            with replica_reads(), self.assertLogs("superlists.routers", "WARNING"):
+                self.assertEqual(self.router.db_for_read(List), "default")
+
+    def test_only_migrates_primary(self):
+        self.assertTrue(self.router.allow_migrate("default", "lists"))
+        self.assertFalse(self.router.allow_migrate("replica1", "lists"))
+
+
+# The test database has no replicas, so "picking" one returns the primary and
+# records that the request was allowed to read from a replica.
+@override_settings(DATABASE_REPLICAS=["replica1"])
+@mock.patch("superlists.routers.healthy_replica", return_value="default")
+class ReplicaRoutingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create(email="a@b.com")
+        self.list_ = List.create_new(first_item_text="item", owner=self.owner)
+
+    def test_read_only_views_read_from_replica(self, healthy_replica):
+        self.client.get(f"/lists/{self.list_.id}/")
+        self.client.get(f"/lists/users/{self.owner.email}/")
+        self.assertEqual(healthy_replica.call_count, 2)
+
+    def test_other_views_read_from_primary(self, healthy_replica):
+        self.client.get("/lists/search", data={"q": "item"})
+        self.client.post(f"/lists/{self.list_.id}/", data={"text": "new item"})
+        healthy_replica.assert_not_called()
+
+    def test_reads_after_a_write_stay_on_primary(self, healthy_replica):
+        self.client.post("/lists/new", data={"text": "new item"})
+        self.assertIn(routers.PRIMARY_UNTIL_SESSION_KEY, self.client.session)
+        self.client.get(f"/lists/{self.list_.id}/")
+        healthy_replica.assert_not_called()
+
+    def test_reads_after_logging_in_stay_on_primary(self, healthy_replica):
+        token = Token.objects.create(email="a@b.com")
+        self.client.get("/accounts/login", data={"token": token.uid})
+        self.client.get(f"/lists/{self.list_.id}/")
+        healthy_replica.assert_not_called()
+
+    def test_stickiness_expires(self, healthy_replica):
+        self.client.post("/lists/new", data={"text": "new item"})
+        with override_settings(REPLICA_STICKY_SECONDS=0):
+            self.client.post("/lists/new", data={"text": "another item"})
+        self.client.get(f"/lists/{self.list_.id}/")
+        healthy_replica.assert_called_once_with()
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class RealReplicaTest(TransactionTestCase):
+    """Reads through a second connection to the test database.
+
+    The replica is set up like the configured ones, with ``TEST: {"MIRROR":
+    "default"}``: it gets the test database's name, and its queries can be
+    told apart from the primary's. It only allows reads. The data is
+    committed, so that the replica's connection can see it.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        connections.databases["replica1"] = dict(
+            connections.databases["default"],
+            PRAGMAS={"query_only": "on"},
+            TEST={"MIRROR": "default"},
+        )
+        replica = connections["replica1"]
+        replica.creation.set_as_test_mirror(connections["default"].settings_dict)
+
+    @classmethod
+    def tearDownClass(cls):
+        replica = connections["replica1"]
+        if replica.connection is not None:
+            replica.connection.close()
+        del connections["replica1"]
+        del connections.databases["replica1"]
+        super().tearDownClass()
+
+    def setUp(self):
+        routers._down_until.clear()
+        self.owner = User.objects.create(email="a@b.com")
+        self.list_ = List.create_new(first_item_text="item", owner=self.owner)
+
+    def get(self, path):
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica1"]) as replica:
+                response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return primary, replica
+
+    def list_reads(self, queries):
+        return [q["sql"] for q in queries if 'FROM "lists_list"' in q["sql"]]
+
+    def test_list_pages_read_from_replica(self):
+        for path in (f"/lists/{self.list_.id}/", "/lists/users/a@b.com/"):
+            with self.subTest(path=path):
+                primary, replica = self.get(path)
+                self.assertTrue(self.list_reads(replica))
+                self.assertEqual(self.list_reads(primary), [])
+
+    def test_reads_go_to_primary_right_after_a_post(self):
+        self.client.post(f"/lists/{self.list_.id}/", data={"text": "new item"})
+        self.assertIn(routers.PRIMARY_UNTIL_SESSION_KEY, self.client.session)
+
+        primary, replica = self.get(f"/lists/{self.list_.id}/")
+
+        self.assertEqual(len(replica), 0)
+        self.assertTrue(self.list_reads(primary))
+        self.assertContains(self.client.get(f"/lists/{self.list_.id}/"), "new item")
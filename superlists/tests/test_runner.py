@@ -0,0 +1,46 @@
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from functional_tests import runner
+
+
+class CloseBrowsersTest(SimpleTestCase):
+    def setUp(self):
+        # Stands in for functional_tests.browsers, which needs selenium
+        self.pool = mock.Mock()
+        browsers = SimpleNamespace(pool=self.pool)
+        patcher = mock.patch.dict(sys.modules, {"functional_tests.browsers": browsers})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_closes_the_pool_after_each_parallel_subsuite(self):
+        with mock.patch.object(runner, "_run_subsuite", return_value=(0, [])):
+            self.assertEqual(runner._run_subsuite_and_close_browsers(()), (0, []))
+        self.pool.close.assert_called_once_with()
+
+    def test_closes_the_pool_when_a_subsuite_fails(self):
+        with mock.patch.object(runner, "_run_subsuite", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                runner._run_subsuite_and_close_browsers(())
+        self.pool.close.assert_called_once_with()
+
+    def test_parallel_workers_run_the_closing_subsuite(self):
+        suite = runner.TestRunner.parallel_test_suite([], processes=2)
+        self.assertIs(
+            suite.run_subsuite.__func__, runner._run_subsuite_and_close_browsers
+        )
+
+    def test_closes_the_pool_at_teardown(self):
+        with mock.patch("django.test.runner.teardown_test_environment"):
+            runner.TestRunner().teardown_test_environment()
+        self.pool.close.assert_called_once_with()
+
+
+class NoBrowsersTest(SimpleTestCase):
+    def test_nothing_to_close_without_functional_tests(self):
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop("functional_tests.browsers", None)
+            runner.close_browsers()
@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from functional_tests.seeding import VERBS, Share, seed
+from lists.models import Item, List
+
+User = get_user_model()
+
+
+class SeedTest(TestCase):
+    def seed(self, **kwargs):
+        options = dict(
+            users=4, lists_per_user=3, items_per_list=5, sharees=2, batch_size=7
+        )
+        options.update(kwargs)
+        return seed(**options)
+
+    def test_creates_and_counts_every_row(self):
+        counts = self.seed()
+        self.assertEqual(
+            dict(counts), {"user": 4, "list": 12, "item": 60, "list_shared_with": 24}
+        )
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(List.objects.count(), 12)
+        self.assertEqual(Item.objects.count(), 60)
+        self.assertEqual(Share.objects.count(), 24)
+
+    def test_every_list_has_its_items_and_sharees(self):
+        self.seed()
+        for list_ in List.objects.all():
+            self.assertEqual(list_.item_set.count(), 5)
+            self.assertEqual(list_.shared_with.count(), 2)
+
+    def test_lists_are_never_shared_with_their_owner(self):
+        self.seed(users=3, sharees=5)
+        self.assertEqual(Share.objects.count(), 3 * 3 * 2)
+        for list_ in List.objects.all():
+            self.assertNotIn(list_.owner, list_.shared_with.all())
+
+    def test_items_are_in_the_search_index(self):
+        self.seed()
+        with connection.cursor() as cursor:
+            for verb in VERBS:
+                cursor.execute(
+                    "SELECT count(*) FROM lists_item_fts WHERE lists_item_fts MATCH %s",
+                    [f'text : "{verb}"'],
+                )
+                self.assertEqual(
+                    cursor.fetchone()[0],
+                    Item.objects.filter(text__startswith=verb + " ").count(),
+                )
+
+    def test_same_random_seed_gives_same_data(self):
+        self.seed()
+        first = list(Item.objects.order_by("id").values_list("list_id", "text"))
+        Item.objects.all().delete()
+        List.objects.all().delete()
+        User.objects.all().delete()
+        self.seed()
+        self.assertEqual(
+            list(Item.objects.order_by("id").values_list("list_id", "text")), first
+        )
+
+
+class SeedDataCommandTest(TestCase):
+    def seed_data(self):
+        stdout = StringIO()
+        call_command(
+            "seed_data",
+            "--users=2",
+            "--lists-per-user=1",
+            "--items-per-list=1",
+            "--sharees=1",
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    def test_reports_rows_per_model(self):
+        output = self.seed_data()
+        self.assertIn("item: 2", output)
+        self.assertIn("user: 2", output)
+
+    def test_refuses_to_seed_twice(self):
+        self.seed_data()
+        with self.assertRaisesRegex(CommandError, "already been seeded"):
+            self.seed_data()
+        self.assertEqual(User.objects.count(), 2)
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+PRODUCTION_PRAGMAS = {"journal_mode": "wal", "synchronous": "normal"}
+
+
+class PragmaBackendTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.db_path = os.path.join(directory, "db.sqlite3")
+
+    def connect(self, **settings):
+        handler = ConnectionHandler(
+            {
+                "default": dict(
+                    ENGINE="superlists.sqlite3",
+                    NAME=self.db_path,
+                    # Fail at once rather than waiting for the lock
+                    OPTIONS={"timeout": 0},
+                    **settings,
+                )
+            }
+        )
+        connection = handler["default"]
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_pragmas_are_applied_on_connect(self):
+        connection = self.connect(PRAGMAS=PRODUCTION_PRAGMAS)
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone(), ("wal",))
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone(), (1,))  # NORMAL
+
+    def count_locked_reads(self, pragmas, attempts=5):
+        writer = self.connect(PRAGMAS=pragmas)
+        reader = self.connect(PRAGMAS=pragmas)
+        with writer.cursor() as cursor:
+            cursor.execute("CREATE TABLE IF NOT EXISTS item (text TEXT)")
+            cursor.execute("INSERT INTO item VALUES ('existing')")
+        # The writer holds its lock as it would while committing
+        writer.cursor().execute("BEGIN EXCLUSIVE")
+        writer.cursor().execute("INSERT INTO item VALUES ('new')")
+        locked = 0
+        for _ in range(attempts):
+            try:
+                with reader.cursor() as cursor:
+                    cursor.execute("SELECT text FROM item")
+                    self.assertEqual(cursor.fetchall(), [("existing",)])
+            except OperationalError as e:
+                self.assertIn("database is locked", str(e))
+                locked += 1
+        writer.cursor().execute("ROLLBACK")
+        return locked
+
+    def test_rollback_journal_locks_out_readers_during_writes(self):
+        self.assertEqual(self.count_locked_reads({}), 5)
+
+    def test_wal_lets_readers_continue_during_writes(self):
+        self.assertEqual(self.count_locked_reads(PRODUCTION_PRAGMAS), 0)
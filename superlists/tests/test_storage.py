@@ -0,0 +1,62 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from superlists import storage
+
+STORAGE = "superlists.storage.CompressedManifestStaticFilesStorage"
+
+
+class CompressedManifestStorageTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings = override_settings(
+            STATIC_ROOT=cls.static_root, STATICFILES_STORAGE=STORAGE
+        )
+        cls.settings.enable()
+        call_command("collectstatic", interactive=False, verbosity=0)
+        with open(os.path.join(cls.static_root, "staticfiles.json")) as f:
+            cls.manifest = json.load(f)["paths"]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def read(self, name):
+        with open(os.path.join(self.static_root, name), "rb") as f:
+            return f.read()
+
+    def test_files_get_content_hashed_names(self):
+        self.assertRegex(self.manifest["list.js"], r"^list\.[0-9a-f]{12}\.js$")
+
+    def test_static_tag_uses_hashed_names(self):
+        rendered = Template("{% load static %}{% static 'list.js' %}").render(
+            Context()
+        )
+        self.assertEqual(rendered, "/static/" + self.manifest["list.js"])
+
+    def test_writes_gzipped_copies_of_hashed_files(self):
+        name = self.manifest["bootstrap/css/bootstrap.min.css"]
+        self.assertEqual(gzip.decompress(self.read(name + ".gz")), self.read(name))
+
+    def test_does_not_compress_fonts_that_are_already_compressed(self):
+        name = self.manifest["bootstrap/fonts/glyphicons-halflings-regular.woff2"]
+        self.assertFalse(os.path.exists(os.path.join(self.static_root, name + ".gz")))
+
+    @unittest.skipIf(storage.brotli is None, "brotli is not installed")
+    def test_writes_brotli_copies_of_hashed_files(self):
+        name = self.manifest["bootstrap/css/bootstrap.min.css"]
+        self.assertEqual(
+            storage.brotli.decompress(self.read(name + ".br")), self.read(name)
+        )
@@ -0,0 +1,216 @@
+import glob
+import json
+import os
+import re
+import tempfile
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from lists import fragment_cache
+from lists.models import List
+from superlists import metrics
+
+
+class ServerTimingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        fragment_cache.reset_stats()
+        self.list_ = List.create_new(first_item_text="item")
+
+    def timings(self, response):
+        return {
+            match.group(1): match.group(2)
+            for match in re.finditer(r"(\w+);dur=([\d.]+)", response["Server-Timing"])
+        }
+
+    def test_header_has_total_db_and_template_time(self):
+        response = self.client.get(self.list_.get_absolute_url())
+        self.assertEqual(set(self.timings(response)), {"total", "db", "template"})
+
+    @override_settings(INTERNAL_IPS=["127.0.0.1"])
+    def test_header_counts_queries_for_internal_requests(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.list_.get_absolute_url())
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+
+    def test_header_does_not_count_queries_for_everyone_else(self):
+        response = self.client.get(self.list_.get_absolute_url())
+        self.assertNotIn("queries", response["Server-Timing"])
+
+    def test_responses_without_templates_have_no_template_time(self):
+        response = self.client.post("/lists/new", data={"text": "new item"})
+        self.assertEqual(set(self.timings(response)), {"total", "db"})
+
+    def test_requests_are_recorded_by_view(self):
+        self.client.get(self.list_.get_absolute_url())
+        self.client.get(self.list_.get_absolute_url())
+        self.client.get("/")
+        text = metrics.render()
+        self.assertIn(
+            'superlists_request_duration_seconds_count{view="view_list"} 2', text
+        )
+        self.assertIn('superlists_request_duration_seconds_count{view="home"} 1', text)
+        self.assertIn('superlists_db_queries_bucket{view="home",le="0"} 1', text)
+
+    def test_unmatched_urls_share_a_label(self):
+        self.client.get("/no/such/page")
+        self.assertIn('{view="unmatched"} 1', metrics.render())
+
+
+class MetricsViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        fragment_cache.reset_stats()
+
+    def test_renders_prometheus_text(self):
+        list_ = List.create_new(first_item_text="item")
+        self.client.get(list_.get_absolute_url())
+        response = self.client.get("/metrics")
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4")
+        text = response.content.decode()
+        self.assertIn("# TYPE superlists_request_duration_seconds histogram", text)
+        self.assertIn(
+            'superlists_request_duration_seconds_bucket{view="view_list",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            'superlists_fragment_cache_misses_total{fragment="table"} 1', text
+        )
+
+
+class MetricsDirTest(TestCase):
+    """Metrics summed over every worker's file in METRICS_DIR."""
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        fragment_cache.reset_stats()
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.metrics_dir.cleanup)
+        settings = override_settings(METRICS_DIR=self.metrics_dir.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Cancel any pending write to the directory
+        self.addCleanup(metrics.reset)
+
+    def other_worker(self, name, home_requests):
+        # As written by another process that has served the home page
+        histogram = metrics.Histogram("h", "Help.", metrics.DURATION_BUCKETS)
+        for _ in range(home_requests):
+            histogram.observe("home", 0.001)
+        snapshot = {
+            "histograms": {metrics.request_duration.name: histogram.snapshot()},
+            "fragments": {"table": {"hits": 5, "misses": 1}},
+        }
+        with open(os.path.join(self.metrics_dir.name, name), "w") as f:
+            json.dump(snapshot, f)
+
+    def home_count(self, text):
+        return re.search(
+            r'superlists_request_duration_seconds_count\{view="home"\} (\d+)', text
+        ).group(1)
+
+    def files(self):
+        return sorted(
+            os.path.basename(path)
+            for path in glob.glob(os.path.join(self.metrics_dir.name, "*.json"))
+        )
+
+    def test_each_process_writes_its_own_file(self):
+        self.client.get("/")
+        own_file = os.path.basename(metrics.process_file(self.metrics_dir.name))
+        self.assertEqual(self.files(), [own_file])
+
+    @patch("superlists.metrics.WRITE_INTERVAL", 0.2)
+    def test_writes_at_most_once_per_interval(self):
+        def written_home_requests():
+            with open(metrics.process_file(self.metrics_dir.name)) as f:
+                histograms = json.load(f)["histograms"]
+            return histograms[metrics.request_duration.name]["home"][-1]
+
+        self.client.get("/")
+        self.client.get("/")
+        self.client.get("/")
+        self.assertEqual(written_home_requests(), 1)
+        # The answering process still reports its latest numbers
+        self.assertEqual(self.home_count(metrics.render()), "3")
+        time.sleep(0.4)
+        self.assertEqual(written_home_requests(), 3)
+
+    def test_sums_requests_served_by_every_worker(self):
+        self.client.get("/")
+        self.other_worker("2-a.json", home_requests=2)
+        self.other_worker("3-b.json", home_requests=3)
+        text = self.client.get("/metrics").content.decode()
+        self.assertIn('superlists_request_duration_seconds_count{view="home"} 6', text)
+        self.assertIn(
+            'superlists_request_duration_seconds_bucket{view="home",le="+Inf"} 6', text
+        )
+        self.assertIn('superlists_fragment_cache_hits_total{fragment="table"} 10', text)
+
+    def test_totals_do_not_go_back_whichever_worker_answers(self):
+        self.other_worker("2-a.json", home_requests=2)
+        counts = []
+        for _ in range(3):
+            self.client.get("/")
+            counts.append(self.home_count(metrics.render()))
+        self.assertEqual(counts, ["3", "4", "5"])
+
+    def test_exited_workers_are_folded_into_one_file(self):
+        self.other_worker("2-a.json", home_requests=2)
+        self.other_worker("3-b.json", home_requests=3)
+        self.other_worker("23-c.json", home_requests=4)
+        before = metrics.render()
+        metrics.fold_exited(self.metrics_dir.name, 2)
+        metrics.fold_exited(self.metrics_dir.name, 3)
+        self.assertEqual(self.files(), ["23-c.json", metrics.EXITED_FILE])
+        self.assertEqual(metrics.render(), before)
+        self.assertEqual(self.home_count(before), "9")
+
+    def test_folding_a_worker_without_a_file_changes_nothing(self):
+        self.other_worker("2-a.json", home_requests=2)
+        metrics.fold_exited(self.metrics_dir.name, 3)
+        self.assertEqual(self.files(), ["2-a.json"])
+
+
+class MergeTest(SimpleTestCase):
+    def test_adds_up_series_and_fragment_counts(self):
+        first = {
+            "histograms": {"h": {"home": [1, 0, 0.5, 1]}},
+            "fragments": {"table": {"hits": 1, "misses": 2}},
+        }
+        second = {
+            "histograms": {"h": {"home": [0, 2, 3.0, 2], "view_list": [1, 0, 0.1, 1]}},
+            "fragments": {"table": {"hits": 3, "misses": 0}},
+        }
+        self.assertEqual(
+            metrics.merge([first, second]),
+            {
+                "histograms": {
+                    "h": {"home": [1, 2, 3.5, 3], "view_list": [1, 0, 0.1, 1]}
+                },
+                "fragments": {"table": {"hits": 4, "misses": 2}},
+            },
+        )
+
+
+class HistogramTest(SimpleTestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("h", "Help.", (1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe("v", value)
+        self.assertEqual(
+            histogram.render()[2:],
+            [
+                'h_bucket{view="v",le="1"} 2',
+                'h_bucket{view="v",le="5"} 3',
+                'h_bucket{view="v",le="+Inf"} 4',
+                'h_sum{view="v"} 14.5',
+                'h_count{view="v"} 4',
+            ],
+        )
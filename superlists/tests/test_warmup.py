@@ -0,0 +1,98 @@
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.db import OperationalError, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+from superlists import warmup, wsgi
+
+
+class WarmUpTest(SimpleTestCase):
+    allow_database_queries = True
+
+    def test_resolves_every_named_url(self):
+        # home, metrics, 6 list URLs and 3 account URLs
+        self.assertEqual(warmup.resolve_urls(), 11)
+
+    def test_loads_project_templates(self):
+        self.assertEqual(warmup.load_templates(), 5)
+
+    def test_logs_and_returns_step_timings(self):
+        with self.assertLogs("superlists.warmup", "INFO") as logs:
+            timings = warmup.warm_up()
+        self.assertEqual(set(timings), {"resolve_urls", "load_templates"})
+        self.assertIn("Warmed up in", logs.output[0])
+
+    def test_does_not_connect_to_the_database(self):
+        # It runs in gunicorn's master, whose connections workers would share
+        with mock.patch.object(BaseDatabaseWrapper, "ensure_connection") as connect:
+            warmup.warm_up()
+        connect.assert_not_called()
+
+    def test_opens_connections(self):
+        self.assertEqual(warmup.open_connections(), 1)
+
+    def test_skips_databases_that_cannot_be_reached(self):
+        with mock.patch.object(
+            BaseDatabaseWrapper,
+            "ensure_connection",
+            side_effect=OperationalError("unable to open database file"),
+        ):
+            with self.assertLogs("superlists.warmup", "WARNING") as logs:
+                opened = warmup.open_connections()
+        self.assertEqual(opened, 0)
+        self.assertIn("Couldn't connect to default", logs.output[0])
+
+
+class OpenConnectionsInTest(SimpleTestCase):
+    allow_database_queries = True
+
+    def on_each_thread(self, executor, threads, fn):
+        barrier = threading.Barrier(threads, timeout=5)
+
+        def call_and_wait():
+            result = fn()
+            barrier.wait()
+            return result
+
+        futures = [executor.submit(call_and_wait) for _ in range(threads)]
+        return [future.result() for future in futures]
+
+    def test_connects_on_every_thread_of_the_pool(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            with self.assertLogs("superlists.warmup", "INFO") as logs:
+                opened = warmup.open_connections_in(executor, 3)
+            connected = self.on_each_thread(
+                executor, 3, lambda: connections["default"].connection is not None
+            )
+            self.on_each_thread(executor, 3, connections.close_all)
+        self.assertEqual(opened, [1, 1, 1])
+        self.assertEqual(connected, [True, True, True])
+        self.assertIn("Opened 3 database connections on 3 threads", logs.output[0])
+
+    @mock.patch("superlists.warmup.THREAD_START_TIMEOUT", 0.1)
+    def test_does_not_hang_when_the_pool_has_fewer_threads(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with self.assertLogs("superlists.warmup", "INFO") as logs:
+                opened = warmup.open_connections_in(executor, 2)
+            executor.submit(connections.close_all).result()
+        self.assertEqual(opened, [1, 1])
+        self.assertIn("on 1 threads", logs.output[0])
+
+
+class WSGIWarmUpTest(SimpleTestCase):
+    def load_wsgi(self):
+        with mock.patch("superlists.warmup.warm_up") as warm_up:
+            importlib.reload(wsgi)
+        return warm_up
+
+    @override_settings(WARM_UP_ON_LOAD=True)
+    def test_warms_up_when_turned_on(self):
+        self.load_wsgi().assert_called_once_with()
+
+    @override_settings(WARM_UP_ON_LOAD=False)
+    def test_does_not_warm_up_by_default(self):
+        self.load_wsgi().assert_not_called()
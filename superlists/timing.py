@@ -0,0 +1,83 @@
+"""Per-request timings, reported in a Server-Timing header and as metrics.
+
+``ServerTimingMiddleware`` times the whole request, the database queries made
+while handling it (counted by the ``superlists.sqlite3`` backend) and the
+rendering of its template response, then adds them to the histograms in
+``superlists.metrics``.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from superlists import metrics
+
+_state = threading.local()
+
+
+class RequestTimer(object):
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.template_start = None
+        self.template_time = None
+
+
+def record_query(duration):
+    timer = getattr(_state, "timer", None)
+    if timer is not None:
+        timer.db_time += duration
+        timer.db_queries += 1
+
+
+def view_label(request):
+    match = request.resolver_match
+    return match.view_name if match else "unmatched"
+
+
+class ServerTimingMiddleware(object):
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _state.timer = RequestTimer()
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.timer = None
+        total = time.perf_counter() - timer.start
+
+        db = f"db;dur={timer.db_time * 1000:.1f}"
+        # Query counts tell outsiders too much about how pages are built. Behind
+        # nginx every request comes from the proxy, so INTERNAL_IPS is empty
+        # in production.
+        if settings.DEBUG or request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS:
+            db += f';desc="{timer.db_queries} queries"'
+        entries = [f"total;dur={total * 1000:.1f}", db]
+        if timer.template_time is not None:
+            entries.append(f"template;dur={timer.template_time * 1000:.1f}")
+        response["Server-Timing"] = ", ".join(entries)
+
+        metrics.observe_request(
+            view_label(request),
+            total,
+            timer.db_time,
+            timer.db_queries,
+            timer.template_time,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # This middleware is first in MIDDLEWARE, so this runs last, just
+        # before the response is rendered.
+        timer = getattr(_state, "timer", None)
+        if timer is not None:
+            timer.template_start = time.perf_counter()
+            response.add_post_render_callback(self._rendered)
+        return response
+
+    def _rendered(self, response):
+        timer = getattr(_state, "timer", None)
+        if timer is not None and timer.template_start is not None:
+            timer.template_time = time.perf_counter() - timer.template_start
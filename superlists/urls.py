@@ -4,10 +4,20 @@ from accounts import urls as account_urls
 # from django.contrib import admin
 from lists import urls as list_urls
 from lists import views as list_views
+from superlists.metrics import MetricsView
 
 urlpatterns = [
     # url(r'^admin/', admin.site.urls),
     url(r"^$", list_views.HomePageView.as_view(), name="home"),
     url(r"^lists/", include(list_urls)),
     url(r"^accounts/", include(account_urls)),
+    url(r"^metrics$", MetricsView.as_view(), name="metrics"),
 ]
+
+# Most queries per request to each URL; see superlists/query_budgets.py
+QUERY_BUDGETS = {
+    "home": 2,
+    "metrics": 0,
+    **list_urls.QUERY_BUDGETS,
+    **account_urls.QUERY_BUDGETS,
+}
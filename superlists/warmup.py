@@ -0,0 +1,124 @@
+"""Do the lazy set-up a new worker would otherwise do on its first requests.
+
+Turned on with ``DJANGO_WARM_UP`` (``WARM_UP_ON_LOAD``), ``superlists.wsgi``
+calls ``warm_up`` once the app is loaded: it compiles and resolves every named
+URL and compiles every template of the project's apps into the cached template
+loader. With gunicorn's ``preload_app`` that happens once in the master, which
+never touches the database. Django connects once per thread, so each worker's
+``post_worker_init`` then calls ``open_connections_in`` its pool of request
+threads, or ``open_connections`` for a sync worker, which serves requests on
+its main thread.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template.loader import get_template
+from django.template.utils import get_app_template_dirs
+from django.urls import NoReverseMatch, get_resolver, resolve, reverse
+
+logger = logging.getLogger(__name__)
+
+# How long open_connections_in waits for the pool to start all its threads
+THREAD_START_TIMEOUT = 10
+
+
+def resolve_urls():
+    """Reverse and resolve every named URL, with "1" for each parameter."""
+    resolved = 0
+    reverse_dict = get_resolver().reverse_dict
+    for name in [key for key in reverse_dict if isinstance(key, str)]:
+        possibilities = reverse_dict.getlist(name)[0][0]
+        _, params = possibilities[0]
+        try:
+            resolve(reverse(name, kwargs={param: "1" for param in params}))
+        except NoReverseMatch:
+            continue
+        resolved += 1
+    return resolved
+
+
+def load_templates():
+    """Compile the templates of the project's own apps."""
+    loaded = 0
+    for directory in get_app_template_dirs("templates"):
+        if not directory.startswith(settings.BASE_DIR):
+            continue
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(".html"):
+                    path = os.path.join(root, filename)
+                    get_template(os.path.relpath(path, directory))
+                    loaded += 1
+    return loaded
+
+
+def open_connections():
+    """Connect to every database that can be reached, and return how many.
+
+    A database that can't be reached, like a replica that is down, is logged
+    and left for the first request that needs it to connect, so the worker
+    still starts.
+    """
+    opened = 0
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except Exception:
+            logger.warning("Couldn't connect to %s", connection.alias, exc_info=True)
+        else:
+            opened += 1
+    return opened
+
+
+def open_connections_in(executor, threads):
+    """Run ``open_connections`` once on each of ``executor``'s ``threads``.
+
+    Each call waits until all of them have started, so no thread runs two and
+    the executor starts as many threads as it may. Returns the connections
+    opened on each thread.
+    """
+    barrier = threading.Barrier(threads, timeout=THREAD_START_TIMEOUT)
+    thread_ids = set()
+
+    def open_and_wait():
+        opened = open_connections()
+        thread_ids.add(threading.get_ident())
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass  # Fewer threads than expected; the rest connect on demand
+        return opened
+
+    start = time.perf_counter()
+    futures = [executor.submit(open_and_wait) for _ in range(threads)]
+    opened = [future.result() for future in futures]
+    logger.info(
+        "Opened %d database connections on %d threads in %.1f ms",
+        sum(opened),
+        len(thread_ids),
+        (time.perf_counter() - start) * 1000,
+    )
+    return opened
+
+
+def warm_up():
+    """Run each warm-up step, logging and returning how long each took in ms."""
+    timings = {}
+    counts = {}
+    for step in (resolve_urls, load_templates):
+        start = time.perf_counter()
+        counts[step.__name__] = step()
+        timings[step.__name__] = (time.perf_counter() - start) * 1000
+    logger.info(
+        "Warmed up in %.1f ms: %d URLs in %.1f ms, %d templates in %.1f ms",
+        sum(timings.values()),
+        counts["resolve_urls"],
+        timings["resolve_urls"],
+        counts["load_templates"],
+        timings["load_templates"],
+    )
+    return timings